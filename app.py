@@ -1,13 +1,16 @@
 # app.py - BULLETPROOF VERSION
 import re
+import threading
+import numpy as np
 import pdfplumber
 import docx
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from collections import Counter
 from datetime import datetime
+from taxonomy import SkillTaxonomy
 
 # Same stopwords as before
-STOPWORDS = {
+STOPWORDS = frozenset({
     'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
     'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
     'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should',
@@ -66,8 +69,8 @@ STOPWORDS = {
     'production', 'applied', 'models', 'algorithms', 'scalable', 'digital',
     'functional', 'professional', 'techniques', 'related', 'deployment',
     'bachelor', 'bachelors', 'master', 'masters', 'phd', 'doctorate', 'degree',
-    'b', 's', 'd', 'ph'
-}
+    'b', 's', 'd', 'ph', 'e.g', 'i.e', 'etc', 'and/or'
+})
 
 def load_resume_text(uploaded_file):
     """Load text from PDF, DOCX, or TXT file"""
@@ -338,37 +341,284 @@ def parse_resume_to_json(text):
         "skills": {"all": skills},
     }
 
+KNOWN_SHORT = frozenset({'c', 'r', 'go', 'c++', 'c#'})
+
+# Fast character-class scan; '.' and '/' stay inside tokens (node.js, ci/cd)
+# and trailing punctuation is stripped in the filter below
+SKILL_TOKEN_PATTERN = re.compile(r"[a-z0-9+#./]+")
+# Slash compounds that name one skill; any other a/b token is split into
+# its parts, so AWS/GCP, C/C++ and R/SAS still yield aws, gcp, c, c++, r, sas
+SLASH_COMPOUNDS = frozenset({
+    'ci/cd', 'ui/ux', 'ux/ui', 'tcp/ip', 'pl/sql', 'ssl/tls', 'pub/sub', 'a/b', 'i/o',
+})
+
+def _split_slashes(slashed):
+    """Keep allowlisted slash compounds whole, split the rest into parts"""
+    out = set()
+    for t in slashed:
+        if t.rstrip("./") in SLASH_COMPOUNDS:
+            out.add(t)
+        else:
+            out.update(p for p in t.split("/") if p)
+    return out
+
 def extract_technical_skills(text):
     """Extract ONLY technical skills"""
-    text_lower = text.lower()
-    tokens = set(re.findall(r"[a-zA-Z0-9\+\#\.]+", text_lower))
-    technical_skills = {t for t in tokens if t not in STOPWORDS}
-    technical_skills = {t for t in technical_skills if not t.isdigit()}
-    known_short = {'c', 'r', 'go', 'c++', 'c#'}
-    technical_skills = {t for t in technical_skills if len(t) > 2 or t in known_short}
-    return technical_skills
-
-def compute_skill_match(jd, resume_text):
-    """Compute skill match"""
-    jd_skills = extract_technical_skills(jd)
+    text = text.lower()
+    tokens = set(SKILL_TOKEN_PATTERN.findall(text))
+    if "/" in text:
+        slashed = {t for t in tokens if "/" in t}
+        if slashed:
+            tokens -= slashed
+            tokens |= _split_slashes(slashed)
+    # Single fused filter; the stopword probe rejects the most tokens, so it goes first
+    return {
+        t for raw in tokens
+        if (t := raw.rstrip("./")) not in STOPWORDS
+        and (len(t) > 2 or t in KNOWN_SHORT) and not t.isdigit()
+    }
+
+class Vocabulary:
+    """Shared skill-token <-> integer id mapping for the index and matrix paths.
+
+    Ids are only ever appended, so arrays built against an older, smaller
+    vocabulary stay valid as it grows.
+    """
+
+    def __init__(self, terms=()):
+        self.ids = {}
+        self.terms = []
+        self._lock = threading.Lock()
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        idx = self.ids.get(term)
+        if idx is None:
+            with self._lock:
+                idx = self.ids.get(term)
+                if idx is None:
+                    idx = len(self.terms)
+                    self.terms.append(term)
+                    self.ids[term] = idx
+        return idx
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self.ids
+
+# One id space for every TopKIndex and section matrix in the process
+SKILL_VOCABULARY = Vocabulary()
+
+def extract_skill_ids(text, vocab=SKILL_VOCABULARY, grow=True):
+    """Same tokens as extract_technical_skills, as sorted int32 ids in vocab.
+
+    With grow=False, terms that are not already in the vocabulary are dropped.
+    """
+    skills = extract_technical_skills(text)
+    if grow:
+        # New terms get ids in sorted order so a fresh vocabulary is deterministic
+        for term in sorted(skills.difference(vocab.ids)):
+            vocab.add(term)
+        ids = np.fromiter(map(vocab.ids.__getitem__, skills), dtype=np.int32, count=len(skills))
+    else:
+        ids = np.fromiter((vocab.ids[t] for t in skills if t in vocab.ids), dtype=np.int32)
+    ids.sort()
+    return ids
+
+# Bump whenever scoring logic changes so cached results are invalidated
+MATCHER_VERSION = 5
+KEYWORD_WEIGHT = 0.7
+SEMANTIC_WEIGHT = 0.3
+# Share of a keyword's credit given when the skill is only implied (pytorch -> deep learning);
+# below 1.0 so demonstrating a skill through a child never counts as naming it
+IMPLIED_CREDIT = 0.5
+# Share given when the resume only has a related skill (scala -> spark)
+RELATED_CREDIT = 0.25
+# Share given when the resume only has a misspelt or versioned form (pytoch, tensorflow2)
+FUZZY_CREDIT = 1.0
+
+SKILL_TAXONOMY = SkillTaxonomy.load()
+
+def taxonomy_tokens(taxonomy):
+    """Canonical skill -> the skill tokens of its name and every alias"""
+    tokens = {}
+    for alias, skill in [*taxonomy.aliases.items(), *taxonomy.context_aliases.items()]:
+        tokens.setdefault(skill, set()).update(extract_technical_skills(alias))
+    return {skill: frozenset(t) for skill, t in tokens.items()}
+
+SKILL_TOKENS = taxonomy_tokens(SKILL_TAXONOMY)
+TOP_CONTRIBUTORS = 10
+# JD skills settled by each matcher stage, summed over all compute_skill_match calls
+MATCH_COUNTERS = Counter()
+
+SEMANTIC_MAX_FEATURES = 100
+TFIDF_ANALYZER = TfidfVectorizer(stop_words='english').build_analyzer()
+
+def term_counts(text):
+    """Term counts as TfidfVectorizer(stop_words='english') tokenises the text"""
+    return Counter(TFIDF_ANALYZER(text.lower()))
+
+def tfidf_cosine(jd_counts, resume_counts, limit=TOP_CONTRIBUTORS):
+    """Cosine of a TF-IDF fit on just [JD, resume], plus the top contributing terms.
+
+    Gives the same numbers as fitting TfidfVectorizer(stop_words='english',
+    max_features=100) on the two texts, but starts from term counts, so a
+    compiled JD's counts are reused instead of refitting per candidate.
+    Rows are L2-normalised, so the cosine is the sum of elementwise
+    products and each product is one term's contribution.
+    """
+    terms = sorted(jd_counts.keys() | resume_counts.keys())
+    if not terms:
+        raise ValueError("empty vocabulary")
+    counts = np.array(
+        [[jd_counts.get(t, 0) for t in terms], [resume_counts.get(t, 0) for t in terms]], dtype=np.int64
+    )
+    if len(terms) > SEMANTIC_MAX_FEATURES:
+        # Most frequent terms, chosen exactly as CountVectorizer._limit_features does
+        keep = np.sort((-counts.sum(axis=0)).argsort()[:SEMANTIC_MAX_FEATURES])
+        counts = counts[:, keep]
+        terms = [terms[i] for i in keep]
+    # Smoothed IDF over the two documents
+    idf = np.log(3 / (1 + (counts > 0).sum(axis=0))) + 1
+    weights = counts * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    weights /= norms
+
+    products = weights[0] * weights[1]
+    contributions = [
+        (terms[i], round(float(products[i]) * 100 * SEMANTIC_WEIGHT, 2))
+        for i in np.flatnonzero(products > 0)
+    ]
+    contributions.sort(key=lambda item: (-item[1], item[0]))
+    return float(products.sum()), contributions[:limit]
+
+def match_skill_tokens(jd_skills, jd_taxonomy_skills, resume_skills, resume_taxonomy_skills):
+    """Credit JD skill tokens against a resume, exactly and through the taxonomy.
+
+    A JD token counts as overlap when the resume has it verbatim or names
+    its taxonomy skill under any alias (golang / go), as implied when a
+    resume skill implies that skill, and as related when it is only one
+    related edge away. "credit" is the keyword credit those earn before
+    any fuzzy matching.
+    """
+    overlap = jd_skills & resume_skills
+    missing = jd_skills - overlap
+    skill_matches = SKILL_TAXONOMY.match(jd_taxonomy_skills, resume_taxonomy_skills)
+
+    def settle(skills):
+        tokens = set()
+        for skill in skills:
+            tokens |= SKILL_TOKENS[skill]
+        return tokens & missing
+
+    alias_hits = settle(skill_matches["direct"])
+    overlap |= alias_hits
+    missing -= alias_hits
+    implied = settle(skill_matches["implied"])
+    missing -= implied
+    related = settle(skill_matches["related"])
+    missing -= related
+    return {
+        "overlap": overlap,
+        "implied": implied,
+        "related": related,
+        "missing": missing,
+        "skill_matches": skill_matches,
+        "credit": len(overlap) + IMPLIED_CREDIT * len(implied) + RELATED_CREDIT * len(related),
+    }
+
+def fuzzy_skill_matches(missing, resume_skills, fuzzy_index):
+    """Missing JD skills whose canonical form the resume has under a typo or variant.
+
+    Only resume tokens the index does not know exactly are looked up; a JD
+    token is resolved through the same index, so "postgres" (an alias) pairs
+    with "postgress" (a typo) via "postgresql".
+    """
+    resolved = fuzzy_index.resolve_all(
+        t for t in sorted(resume_skills) if t not in fuzzy_index.vocabulary
+    )
+    by_skill = {}
+    for token, skill in resolved.items():
+        by_skill.setdefault(skill, token)
+    matches = {}
+    for token in missing:
+        skill = fuzzy_index.lookup(token)
+        if skill in by_skill:
+            matches[token] = by_skill[skill]
+    return matches
+
+def compute_skill_match(jd, resume_text, fuzzy_index=None):
+    """Compute skill match (jd is raw text or a compiled JDProfile).
+
+    fuzzy_index (a fuzzy.SymSpellIndex) enables the typo-tolerant stage.
+    """
+    if isinstance(jd, str):
+        jd_skills, jd_counts = extract_technical_skills(jd), term_counts(jd)
+        jd_taxonomy_skills = SKILL_TAXONOMY.skills_in(jd)
+    else:
+        jd_skills, jd_counts = set(jd.skills), jd.term_counts
+        jd_taxonomy_skills = jd.taxonomy_skills
     resume_skills = extract_technical_skills(resume_text)
-    overlap = list(jd_skills & resume_skills)
-    missing = list(jd_skills - resume_skills)
     
     if len(jd_skills) == 0:
-        return {"score": 0, "overlap": [], "missing": []}
+        return {
+            "score": 0, "overlap": [], "missing": [], "implied": [], "related": [], "fuzzy": {},
+            "skill_matches": {"direct": [], "implied": {}, "related": {}},
+            "breakdown": {"keyword": 0.0, "semantic": 0.0}, "contributions": [],
+        }
+
+    # JD skills the resume demonstrates through the taxonomy stop being "missing"
+    matched = match_skill_tokens(
+        jd_skills, jd_taxonomy_skills, resume_skills, SKILL_TAXONOMY.skills_in(resume_text)
+    )
+    missing = matched["missing"]
+    skill_matches = matched["skill_matches"]
+
+    fuzzy = {}
+    if fuzzy_index is not None and missing:
+        fuzzy = fuzzy_skill_matches(sorted(missing), resume_skills - jd_skills, fuzzy_index)
+        missing = missing - fuzzy.keys()
+
+    MATCH_COUNTERS.update(
+        exact=len(matched["overlap"]), implied=len(matched["implied"]), related=len(matched["related"]),
+        fuzzy=len(fuzzy), missing=len(missing)
+    )
     
-    keyword_match_pct = (len(overlap) / len(jd_skills)) * 100
+    credited = matched["credit"] + FUZZY_CREDIT * len(fuzzy)
+    keyword_match_pct = (credited / len(jd_skills)) * 100
     
     try:
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=100)
-        tfidf = vectorizer.fit_transform([jd.lower(), resume_text.lower()])
-        semantic_sim = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
-        final_score = (keyword_match_pct * 0.7) + (semantic_sim * 100 * 0.3)
-    except:
+        semantic_sim, contributions = tfidf_cosine(jd_counts, term_counts(resume_text))
+        keyword_part = keyword_match_pct * KEYWORD_WEIGHT
+        semantic_part = semantic_sim * 100 * SEMANTIC_WEIGHT
+        final_score = keyword_part + semantic_part
+    except ValueError:
         final_score = keyword_match_pct
+        keyword_part, semantic_part = keyword_match_pct, 0.0
+        contributions = []
     
-    return {"score": round(final_score, 2), "overlap": sorted(overlap), "missing": sorted(missing)}
+    return {
+        "score": round(final_score, 2),
+        "overlap": sorted(matched["overlap"]),
+        "missing": sorted(missing),
+        "implied": sorted(matched["implied"]),
+        "related": sorted(matched["related"]),
+        "fuzzy": dict(sorted(fuzzy.items())),
+        "skill_matches": {
+            "direct": skill_matches["direct"],
+            "implied": skill_matches["implied"],
+            "related": skill_matches["related"],
+        },
+        "breakdown": {
+            "keyword": round(float(keyword_part), 2),
+            "semantic": round(float(semantic_part), 2),
+        },
+        "contributions": contributions,
+    }
 
 def extract_min_years(jd_text):
     """Extract minimum years"""
@@ -377,6 +627,16 @@ def extract_min_years(jd_text):
         return int(matches[0])
     return 0
 
+# Formula: FT * 1.0 + PT * 0.6 + INT * 0.8
+EMPLOYMENT_WEIGHTS = {"FT": 1.0, "PT": 0.6, "INT": 0.8}
+
+def compute_weighted_months(experiences):
+    """Weighted months of experience (unknown types count as part-time)"""
+    return sum(
+        (e.get("months") or 0) * EMPLOYMENT_WEIGHTS.get(e.get("employment_type", "FT"), EMPLOYMENT_WEIGHTS["PT"])
+        for e in experiences
+    )
+
 def estimate_seniority(months):
     """Estimate seniority"""
     if months < 24:
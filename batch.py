@@ -0,0 +1,210 @@
+# batch.py - PROCESS-POOL BATCH SCORING
+"""
+Score one JD against many resumes across cores.
+
+The corpus (resume texts), its vocabulary and IDF array are copied into
+multiprocessing.shared_memory once. Workers attach by name in their pool
+initializer, so a task is just a (start, stop) range of resume ids plus the
+compiled JD, and results are written straight into a shared float64 array
+instead of being pickled back.
+
+The keyword part gives the same exact, alias, implied and related credit
+as compute_skill_match without a fuzzy index, so keyword percentages match
+it exactly. The cosine part uses IDF fitted on the whole corpus rather than
+the two-document fit inside compute_skill_match, so the semantic part is a
+corpus-level variant of it.
+"""
+import os
+from collections import Counter
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app import KEYWORD_WEIGHT, SEMANTIC_WEIGHT, SKILL_TAXONOMY, extract_technical_skills, match_skill_tokens
+
+SCORE_COLUMNS = ("score", "keyword", "cosine", "overlap")
+DEFAULT_CHUNK_SIZE = 64
+
+_analyzer = TfidfVectorizer(stop_words="english").build_analyzer()
+
+# Per-process view of the shared corpus, filled by _attach()
+_worker: Dict[str, object] = {}
+
+
+def fit_corpus(texts: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """Vocabulary and smoothed IDF over the resume corpus"""
+    vectorizer = TfidfVectorizer(stop_words="english")
+    vectorizer.fit(t.lower() for t in texts)
+    return list(vectorizer.get_feature_names_out()), vectorizer.idf_
+
+
+def jd_vector(jd_text: str, term_ids: Dict[str, int], idf: np.ndarray) -> Dict[int, float]:
+    """L2-normalised TF-IDF weights of the JD in corpus space"""
+    counts = Counter(_analyzer(jd_text.lower()))
+    weights = {term_ids[t]: c * idf[term_ids[t]] for t, c in counts.items() if t in term_ids}
+    norm = np.sqrt(sum(w * w for w in weights.values()))
+    return {i: w / norm for i, w in weights.items()} if norm else {}
+
+
+def jd_skill_sets(jd):
+    """(skill tokens, taxonomy skills) of a JD given as raw text or a JDProfile"""
+    if isinstance(jd, str):
+        return extract_technical_skills(jd), SKILL_TAXONOMY.skills_in(jd)
+    return set(jd.skills), set(jd.taxonomy_skills)
+
+
+def score_text(text, jd_skills, jd_taxonomy_skills, jd_vec, term_ids, idf):
+    """(score, keyword %, cosine, overlap count) for one resume"""
+    overlap = 0
+    keyword_pct = 0.0
+    if jd_skills:
+        matched = match_skill_tokens(
+            jd_skills, jd_taxonomy_skills, extract_technical_skills(text), SKILL_TAXONOMY.skills_in(text)
+        )
+        overlap = len(matched["overlap"])
+        keyword_pct = matched["credit"] / len(jd_skills) * 100
+
+    counts = Counter(_analyzer(text.lower()))
+    dot = norm_sq = 0.0
+    for term, c in counts.items():
+        idx = term_ids.get(term)
+        if idx is None:
+            continue
+        w = c * idf[idx]
+        norm_sq += w * w
+        dot += w * jd_vec.get(idx, 0.0)
+    cosine = dot / np.sqrt(norm_sq) if norm_sq else 0.0
+
+    score = keyword_pct * KEYWORD_WEIGHT + cosine * 100 * SEMANTIC_WEIGHT
+    return score, keyword_pct, cosine, overlap
+
+
+def _shared_array(arr: np.ndarray) -> SharedMemory:
+    shm = SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm
+
+
+def _attach(names, n_docs, n_terms, blob_size):
+    """Pool initializer: map the shared corpus once per worker"""
+    blocks = {key: SharedMemory(name=name) for key, name in names.items()}
+    vocab = bytes(blocks["vocab"].buf[:blob_size["vocab"]]).decode("utf-8")
+    _worker.update(
+        blocks=blocks,
+        texts=blocks["texts"].buf,
+        offsets=np.ndarray((n_docs + 1,), dtype=np.int64, buffer=blocks["offsets"].buf),
+        idf=np.ndarray((n_terms,), dtype=np.float64, buffer=blocks["idf"].buf),
+        results=np.ndarray((n_docs, len(SCORE_COLUMNS)), dtype=np.float64, buffer=blocks["results"].buf),
+        term_ids={t: i for i, t in enumerate(vocab.split("\n"))} if vocab else {},
+    )
+
+
+def _score_range(task):
+    """Score resume ids [start, stop) into the shared results array"""
+    start, stop, jd_skills, jd_taxonomy_skills, jd_vec = task
+    texts, offsets, results = _worker["texts"], _worker["offsets"], _worker["results"]
+    term_ids, idf = _worker["term_ids"], _worker["idf"]
+    for i in range(start, stop):
+        text = bytes(texts[offsets[i]:offsets[i + 1]]).decode("utf-8")
+        results[i] = score_text(text, jd_skills, jd_taxonomy_skills, jd_vec, term_ids, idf)
+    return stop - start
+
+
+class BatchScorer:
+    """Score JDs against a fixed resume corpus on a process pool.
+
+    Use as a context manager (or call close()) so the shared memory blocks
+    are released.
+    """
+
+    def __init__(self, texts: Sequence[str], workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.n_docs = len(texts)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+
+        terms, idf = fit_corpus(texts) if texts else ([], np.zeros(0))
+        self.term_ids = {t: i for i, t in enumerate(terms)}
+        self.idf = idf
+
+        encoded = [t.encode("utf-8") for t in texts]
+        offsets = np.zeros(self.n_docs + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        vocab_blob = "\n".join(terms).encode("utf-8")
+
+        self._blocks = {
+            "texts": _shared_array(np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+            "offsets": _shared_array(offsets),
+            "vocab": _shared_array(np.frombuffer(vocab_blob, dtype=np.uint8)),
+            "idf": _shared_array(np.asarray(idf, dtype=np.float64)),
+            "results": _shared_array(np.zeros((self.n_docs, len(SCORE_COLUMNS)))),
+        }
+        initargs = (
+            {key: shm.name for key, shm in self._blocks.items()},
+            self.n_docs, len(terms), {"vocab": len(vocab_blob)},
+        )
+
+        self._local: Dict[str, object] = {}
+        if self.workers > 1:
+            self._pool = get_context().Pool(self.workers, initializer=_attach, initargs=initargs)
+        else:
+            # Serial mode runs the same code path in-process
+            self._pool = None
+            _attach(*initargs)
+            self._local = dict(_worker)
+
+    def score(self, jd) -> np.ndarray:
+        """Array of shape (n_docs, 4) with columns SCORE_COLUMNS.
+
+        jd is raw text or a compiled JDProfile.
+        """
+        jd_text = jd if isinstance(jd, str) else jd.text
+        jd_skills, jd_taxonomy_skills = jd_skill_sets(jd)
+        jd_vec = jd_vector(jd_text, self.term_ids, self.idf)
+
+        tasks = [
+            (start, min(start + self.chunk_size, self.n_docs), jd_skills, jd_taxonomy_skills, jd_vec)
+            for start in range(0, self.n_docs, self.chunk_size)
+        ]
+        if self._pool is None:
+            _worker.update(self._local)
+            for task in tasks:
+                _score_range(task)
+        else:
+            self._pool.map(_score_range, tasks)
+
+        results = np.ndarray(
+            (self.n_docs, len(SCORE_COLUMNS)), dtype=np.float64, buffer=self._blocks["results"].buf
+        )
+        return results.copy()
+
+    def rank(self, jd, top: int = None) -> List[Tuple[int, float]]:
+        """(resume id, score) pairs, best first"""
+        scores = self.score(jd)[:, 0]
+        order = np.argsort(-scores, kind="stable")[:top]
+        return [(int(i), round(float(scores[i]), 2)) for i in order]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        elif self._local:
+            # Drop the array views before closing the in-process mappings
+            attached = self._local["blocks"]
+            _worker.clear()
+            self._local = {}
+            for shm in attached.values():
+                shm.close()
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,70 @@
+# bench_batch.py - BatchScorer scaling across worker counts
+"""
+Score one JD against a synthetic corpus built from sample.json with
+1..N workers and report throughput.
+
+    python benchmarks/bench_batch.py [n_resumes] [max_workers] [chunk_size]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import compute_skill_match  # noqa: E402
+from batch import DEFAULT_CHUNK_SIZE, BatchScorer  # noqa: E402
+from jd_profile import get_jd_profile  # noqa: E402
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "sample.json")
+
+JD = """Machine Learning Engineer
+Requirements:
+- 3+ years of Python, PyTorch and deep learning in production
+- AWS, Docker, Kubernetes, CI/CD
+Preferred:
+- Spark, Airflow, Kafka, FastAPI, NLP
+"""
+
+
+def synthetic_corpus(n, seed=0):
+    """Short resumes made by mixing lines from the sample resumes"""
+    with open(SAMPLE) as f:
+        lines = [
+            line for sections in json.load(f).values()
+            for text in sections.values() for line in text.splitlines() if line.strip()
+        ]
+    rng = random.Random(seed)
+    return ["\n".join(rng.sample(lines, 12)) for _ in range(n)]
+
+
+def main(n=2000, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    max_workers = max_workers or os.cpu_count() or 1
+    texts = synthetic_corpus(n)
+    profile = get_jd_profile(JD)
+    print(f"{n} resumes, chunk_size={chunk_size}, cpu_count={os.cpu_count()}")
+
+    start = time.perf_counter()
+    for text in texts[:200]:
+        compute_skill_match(profile, text)
+    per_doc = (time.perf_counter() - start) / 200
+    print(f"{'compute_skill_match loop':>26}: {1 / per_doc:8.0f} resumes/s")
+
+    workers = 1
+    baseline = None
+    while workers <= max_workers:
+        with BatchScorer(texts, workers=workers, chunk_size=chunk_size) as scorer:
+            scorer.score(profile)  # warm up the pool
+            start = time.perf_counter()
+            scorer.score(profile)
+            elapsed = time.perf_counter() - start
+        rate = n / elapsed
+        baseline = baseline or rate
+        print(f"{f'BatchScorer workers={workers}':>26}: {rate:8.0f} resumes/s  x{rate / baseline:.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
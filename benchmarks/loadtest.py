@@ -0,0 +1,201 @@
+# loadtest.py - concurrent load test of the extract -> parse -> match path
+"""
+Drive load_resume_text, parse_resume_to_json and compute_skill_match from a
+rising number of concurrent clients, against a fixed pool of worker threads
+and then a fixed pool of worker processes.
+
+Inputs are a mix of PDF, DOCX and TXT resumes generated locally from
+sample.json (the PDFs are written by hand, no extra dependency). Each client
+sends one request, waits for it, and sends the next (closed loop).
+
+Per concurrency level it reports:
+  req/s, p50/p95/p99   throughput and end-to-end latency seen by clients
+  queue / service      mean time a request waited for a free worker vs. the
+                       time a worker spent on it; queue >> service means the
+                       pool is saturated
+  util                 busy worker-seconds / (wall * workers)
+  cpu/svc              CPU time of the serving thread or process divided by
+                       its service time. Near 1.0 means the work ran
+                       uninterrupted. A thread-pool ratio that falls while
+                       the process-pool ratio holds is GIL contention: the
+                       worker was runnable but waiting for the interpreter
+                       lock. With fewer cores than workers both ratios fall
+                       from plain CPU sharing, so compare the two modes.
+
+    python benchmarks/loadtest.py [requests_per_level] [max_concurrency] [workers]
+"""
+import io
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import docx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app import compute_skill_match, load_resume_text, parse_resume_to_json  # noqa: E402
+from bench_batch import JD, synthetic_corpus  # noqa: E402
+
+# Repeating input format pattern: 40% PDF, 30% DOCX, 30% TXT
+FORMAT_MIX = ("pdf", "docx", "txt", "pdf", "docx", "txt", "pdf", "docx", "txt", "pdf")
+PDF_LINE_HEIGHT = 12
+PDF_LINES_PER_PAGE = 60
+
+
+def _pdf_escape(line):
+    line = line.encode("latin-1", errors="replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text):
+    """Minimal multi-page PDF (Helvetica, one text line per Tj) that pdfplumber can read"""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)]
+    font_id = 3
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>", font_id: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    next_id = 4
+    for page_lines in pages:
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        ops = [f"BT /F1 10 Tf {PDF_LINE_HEIGHT} TL 50 750 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in page_lines]
+        ops.append("ET")
+        stream = "\n".join(ops)
+        objects[content_id] = f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream"
+        objects[page_id] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        kids.append(f"{page_id} 0 R")
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for obj_id in range(1, size):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def make_docx(text):
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def make_inputs(n, seed=0):
+    """(file name, bytes) pairs, formats interleaved in FORMAT_MIX proportions"""
+    encoders = {"pdf": make_pdf, "docx": make_docx, "txt": lambda t: t.encode("utf-8")}
+    inputs = []
+    for i, text in enumerate(synthetic_corpus(n, seed)):
+        fmt = FORMAT_MIX[i % len(FORMAT_MIX)]
+        inputs.append((f"resume_{i}.{fmt}", encoders[fmt](text)))
+    return inputs
+
+
+def handle_request(name, payload, jd_text, submitted):
+    """One match request, timed from inside the worker (monotonic is system-wide)"""
+    started = time.monotonic()
+    cpu_start = time.thread_time()
+    upload = io.BytesIO(payload)
+    upload.name = name
+    text = load_resume_text(upload)
+    parse_resume_to_json(text)
+    compute_skill_match(jd_text, text)
+    return {
+        "queue": started - submitted,
+        "service": time.monotonic() - started,
+        "cpu": time.thread_time() - cpu_start,
+    }
+
+
+def _warm_up(_):
+    return os.getpid()
+
+
+def run_level(pool, workers, inputs, concurrency, n_requests):
+    """Closed-loop run: `concurrency` clients share n_requests; returns summary stats"""
+    samples = []
+    lock = threading.Lock()
+    issued = iter(range(n_requests))
+
+    def client():
+        while True:
+            with lock:
+                i = next(issued, None)
+            if i is None:
+                return
+            name, payload = inputs[i % len(inputs)]
+            sent = time.monotonic()
+            sample = pool.submit(handle_request, name, payload, JD, sent).result()
+            sample["latency"] = time.monotonic() - sent
+            with lock:
+                samples.append(sample)
+
+    start = time.monotonic()
+    clients = [threading.Thread(target=client) for _ in range(concurrency)]
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    wall = time.monotonic() - start
+
+    latencies = sorted(s["latency"] for s in samples)
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    service = sum(s["service"] for s in samples)
+    return {
+        "rps": len(samples) / wall,
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "queue": statistics.fmean(s["queue"] for s in samples),
+        "service": service / len(samples),
+        "util": service / (wall * workers),
+        "cpu_ratio": sum(s["cpu"] for s in samples) / service,
+    }
+
+
+def report(mode, concurrency, r):
+    print(
+        f"{mode:>8} {concurrency:>4} {r['rps']:8.1f} "
+        f"{r['p50'] * 1000:8.1f} {r['p95'] * 1000:8.1f} {r['p99'] * 1000:8.1f} "
+        f"{r['queue'] * 1000:9.1f} {r['service'] * 1000:9.1f} {r['util']:6.2f} {r['cpu_ratio']:8.2f}"
+    )
+
+
+def main(n_requests=200, max_concurrency=16, workers=4):
+    inputs = make_inputs(min(n_requests, 300))
+    levels = []
+    c = 1
+    while c <= max_concurrency:
+        levels.append(c)
+        c *= 2
+    print(f"{n_requests} requests per level, {workers} workers, cpu_count={os.cpu_count()}")
+    print(f"{'mode':>8} {'conc':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'queue ms':>9} {'svc ms':>9} {'util':>6} {'cpu/svc':>8}")
+
+    for mode, executor in (("threads", ThreadPoolExecutor), ("procs", ProcessPoolExecutor)):
+        with executor(workers) as pool:
+            # Start every worker (and its imports) before timing anything
+            list(pool.map(_warm_up, range(workers * 2)))
+            run_level(pool, workers, inputs, 1, min(n_requests, 20))
+            for concurrency in levels:
+                report(mode, concurrency, run_level(pool, workers, inputs, concurrency, n_requests))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    main(*args)
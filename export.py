@@ -0,0 +1,74 @@
+# export.py - STREAMING EXPORT OF RANKED RESULTS
+"""
+Write ranked bulk-scoring results to CSV or Parquet a page at a time.
+
+Input is an iterable of pages (lists of JobQueue result dicts, best first),
+e.g. JobQueue.iter_results(batch), so memory is bounded by the page size
+however many candidates were ranked. Parquet needs pyarrow, which is
+optional.
+"""
+import csv
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+EXPORT_COLUMNS = ("rank", "name", "score", "matched", "missing", "weighted_months")
+
+
+def export_row(rank: int, result: Dict[str, Any]) -> Tuple:
+    return (
+        rank,
+        result["name"],
+        result["score"],
+        len(result["overlap"]),
+        len(result["missing"]),
+        result.get("weighted_months", 0.0),
+    )
+
+
+def _rows(pages: Iterable[List[Dict[str, Any]]]) -> Iterable[List[Tuple]]:
+    rank = 0
+    for page in pages:
+        rows = []
+        for result in page:
+            rank += 1
+            rows.append(export_row(rank, result))
+        yield rows
+
+
+def write_csv(pages: Iterable[List[Dict[str, Any]]], path: str) -> int:
+    """Stream pages to a CSV file; returns the number of rows written"""
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in _rows(pages):
+            writer.writerows(rows)
+            written += len(rows)
+    return written
+
+
+def write_parquet(pages: Iterable[List[Dict[str, Any]]], path: str) -> int:
+    """Stream pages to a Parquet file, one row group per page"""
+    if pa is None:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+    schema = pa.schema([
+        ("rank", pa.int32()),
+        ("name", pa.string()),
+        ("score", pa.float64()),
+        ("matched", pa.int32()),
+        ("missing", pa.int32()),
+        ("weighted_months", pa.float64()),
+    ])
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in _rows(pages):
+            if rows:
+                arrays = [pa.array(column, type=f.type) for column, f in zip(zip(*rows), schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                written += len(rows)
+    return written
@@ -0,0 +1,148 @@
+# fuzzy.py - TYPO-TOLERANT SKILL LOOKUP
+"""
+SymSpell-style index that resolves misspelt or versioned tokens ("pytoch",
+"kubernets", "tensorflow2") to a canonical skill.
+
+Every vocabulary term is stored under all of its deletion variants up to
+max_distance. A lookup generates the query's own deletion variants, so
+candidates come from a handful of dict probes instead of an edit-distance
+scan of the whole vocabulary, and only those few candidates are verified
+with a bounded Damerau-Levenshtein distance. Results are memoised in a
+bounded LRU, since the same tokens recur across resumes but the stream of
+unknown tokens never ends.
+"""
+import threading
+import hashlib
+import json
+from collections import Counter, OrderedDict, defaultdict
+from itertools import combinations
+from typing import Dict, Iterable, Optional, Set
+
+from app import SKILL_TAXONOMY
+
+DEFAULT_MAX_DISTANCE = 2
+MIN_TOKEN_LENGTH = 5
+# Tokens shorter than this only get distance 1, must keep their first letter
+# and may not substitute a letter (a dropped, added or swapped letter is a
+# typo; "reach" -> "react" or "scale" -> "scala" is a different word)
+LONG_TOKEN_LENGTH = 8
+MEMO_SIZE = 8192
+
+
+def deletes(term: str, distance: int) -> Set[str]:
+    """All strings reachable from term by deleting up to `distance` chars"""
+    out = {term}
+    for d in range(1, min(distance, len(term) - 1) + 1):
+        for idx in combinations(range(len(term)), d):
+            out.add("".join(c for i, c in enumerate(term) if i not in idx))
+    return out
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal-string-alignment distance, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _plausible_short_typo(token: str, term: str) -> bool:
+    if token[0] != term[0]:
+        return False
+    # Same length at distance 1 is a substitution unless it is a transposition
+    return len(token) != len(term) or sorted(token) == sorted(term)
+
+
+class SymSpellIndex:
+    """Fuzzy term -> canonical skill lookup with per-stage counters"""
+
+    def __init__(self, vocabulary: Dict[str, str], max_distance: int = DEFAULT_MAX_DISTANCE,
+                 memo_size: int = MEMO_SIZE):
+        # vocabulary maps each spelling (canonical name or alias) to its canonical skill
+        self.vocabulary = dict(vocabulary)
+        self.max_distance = max_distance
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+        for term in self.vocabulary:
+            for variant in deletes(term, max_distance):
+                self._deletes[variant].add(term)
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        # One index is shared by every Streamlit session
+        self._memo_lock = threading.Lock()
+        self.counters = Counter()
+        # Identifies what this index can resolve, for score_cache keys
+        self.fingerprint = hashlib.sha256(json.dumps({
+            "vocabulary": sorted(self.vocabulary.items()),
+            "max_distance": max_distance,
+            "min_token_length": MIN_TOKEN_LENGTH,
+            "long_token_length": LONG_TOKEN_LENGTH,
+        }).encode("utf-8")).hexdigest()[:16]
+
+    def allowed_distance(self, token: str) -> int:
+        return self.max_distance if len(token) >= LONG_TOKEN_LENGTH else min(1, self.max_distance)
+
+    def lookup(self, token: str) -> Optional[str]:
+        """Canonical skill for token within the allowed distance, else None"""
+        self.counters["lookups"] += 1
+        if token in self.vocabulary:
+            self.counters["exact"] += 1
+            return self.vocabulary[token]
+        if len(token) < MIN_TOKEN_LENGTH:
+            self.counters["too_short"] += 1
+            return None
+        with self._memo_lock:
+            if token in self._memo:
+                self._memo.move_to_end(token)
+                self.counters["memo_hits"] += 1
+                return self._memo[token]
+
+        limit = self.allowed_distance(token)
+        candidates = set()
+        for variant in deletes(token, limit):
+            candidates |= self._deletes.get(variant, set())
+
+        best = None
+        for term in candidates:
+            if len(token) < LONG_TOKEN_LENGTH and not _plausible_short_typo(token, term):
+                continue
+            dist = edit_distance(token, term, limit)
+            if dist <= limit and (best is None or (dist, term) < best):
+                best = (dist, term)
+
+        result = self.vocabulary[best[1]] if best else None
+        self.counters["resolved" if result else "unresolved"] += 1
+        with self._memo_lock:
+            self._memo[token] = result
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return result
+
+    def resolve_all(self, tokens: Iterable[str]) -> Dict[str, str]:
+        """token -> canonical skill for the tokens that resolve"""
+        out = {}
+        for token in tokens:
+            skill = self.lookup(token)
+            if skill:
+                out[token] = skill
+        return out
+
+
+def build_skill_index(max_distance: int = DEFAULT_MAX_DISTANCE) -> SymSpellIndex:
+    """Index over the single-word skill names and aliases of the taxonomy"""
+    vocabulary = {
+        spelling: skill
+        for spelling, skill in SKILL_TAXONOMY.aliases.items()
+        if " " not in spelling
+    }
+    return SymSpellIndex(vocabulary, max_distance)
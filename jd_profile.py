@@ -0,0 +1,135 @@
+# jd_profile.py - COMPILED JOB DESCRIPTIONS
+"""
+Compile a job description once and reuse it for every candidate.
+
+A JDProfile holds everything the matchers derive from the JD text: the skill
+set, the term counts (compute_skill_match builds its TF-IDF cosine from
+them), the minimum years and a required/preferred split taken from the
+JD's own headings. Profiles are cached by text hash and are plain
+picklable data, so batch workers can be handed a profile instead of raw text.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict
+
+from app import SKILL_TAXONOMY, extract_min_years, extract_technical_skills, term_counts
+
+JD_CACHE_SIZE = 256
+
+REQUIRED_HEADING = re.compile(
+    r"^(?:requirements?|required(?: skills| qualifications)?|"
+    r"(?:minimum|basic) qualifications|qualifications|must[- ]haves?|"
+    r"what you(?:'ll)? need)$"
+)
+PREFERRED_HEADING = re.compile(
+    r"^(?:preferred(?: skills| qualifications)?|nice[- ]to[- ]haves?|"
+    r"bonus(?: points)?|pluses|additional qualifications)$"
+)
+# Any other short "Heading:" line ends the current requirement block
+OTHER_HEADING = re.compile(r"^[a-z][a-z &/'-]{2,40}:$")
+
+_cache: "OrderedDict[str, JDProfile]" = OrderedDict()
+# Streamlit sessions call get_jd_profile from several threads
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class JDProfile:
+    """Everything the matchers need from one JD, computed once"""
+    text: str
+    text_hash: str
+    skills: frozenset
+    required: frozenset
+    preferred: frozenset
+    min_years: int
+    term_counts: Dict[str, int] = field(default_factory=dict)
+    taxonomy_skills: frozenset = frozenset()
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        for key in ("skills", "required", "preferred", "taxonomy_skills"):
+            d[key] = sorted(d[key])
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "JDProfile":
+        return cls(
+            text=d["text"],
+            text_hash=d["text_hash"],
+            skills=frozenset(d["skills"]),
+            required=frozenset(d["required"]),
+            preferred=frozenset(d["preferred"]),
+            min_years=d["min_years"],
+            term_counts=dict(d["term_counts"]),
+            taxonomy_skills=frozenset(d.get("taxonomy_skills", [])),
+        )
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def split_requirements(text: str):
+    """Split JD skills into required/preferred using the JD's headings"""
+    required, preferred = set(), set()
+    found_heading = False
+    bucket = None
+
+    for line in text.splitlines():
+        stripped = line.strip().strip("*#•-–: ").lower()
+        # "Preferred: Spark, Airflow" carries skills on the heading line
+        head, _, rest = line.strip().strip("*#•-– ").partition(":")
+        head = head.strip().lower()
+
+        if REQUIRED_HEADING.match(stripped) or (rest and REQUIRED_HEADING.match(head)):
+            bucket, found_heading = required, True
+            line = rest
+        elif PREFERRED_HEADING.match(stripped) or (rest and PREFERRED_HEADING.match(head)):
+            bucket, found_heading = preferred, True
+            line = rest
+        elif OTHER_HEADING.match(line.strip().lower()):
+            bucket = None
+            continue
+
+        if bucket is not None:
+            bucket |= extract_technical_skills(line)
+
+    if not found_heading:
+        return extract_technical_skills(text), set()
+    return required, preferred - required
+
+
+def compile_jd(text: str, key: str = None) -> JDProfile:
+    """Build a JDProfile from raw JD text (uncached)"""
+    required, preferred = split_requirements(text)
+    return JDProfile(
+        text=text,
+        text_hash=key or text_hash(text),
+        skills=frozenset(extract_technical_skills(text)),
+        required=frozenset(required),
+        preferred=frozenset(preferred),
+        min_years=extract_min_years(text),
+        term_counts=dict(term_counts(text)),
+        taxonomy_skills=frozenset(SKILL_TAXONOMY.skills_in(text)),
+    )
+
+
+def get_jd_profile(text: str) -> JDProfile:
+    """Compiled JD profile, cached (LRU) by text hash"""
+    key = text_hash(text)
+    with _cache_lock:
+        profile = _cache.get(key)
+        if profile is not None:
+            _cache.move_to_end(key)
+            return profile
+
+    profile = compile_jd(text, key)
+    with _cache_lock:
+        _cache[key] = profile
+        _cache.move_to_end(key)
+        if len(_cache) > JD_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return profile
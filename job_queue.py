@@ -0,0 +1,231 @@
+# job_queue.py - PERSISTENT BACKGROUND PARSE/SCORE QUEUE
+"""
+Local job queue for bulk resume uploads.
+
+Each uploaded file becomes a row in a SQLite jobs table (status pending ->
+running -> done / failed) holding the file bytes. A dispatcher thread claims
+pending jobs and hands them to a process pool, which extracts, parses and
+scores them against the batch's JD; results are written back as JSON. The
+Streamlit script only enqueues and reads rows, so reruns never block on or
+lose the work, and jobs left "running" by a killed server are put back to
+pending when the queue is reopened. If a worker process dies and breaks the
+pool, a fresh pool is started and jobs not yet handed over go back to
+pending.
+"""
+import io
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app import (
+    compute_skill_match,
+    compute_weighted_months,
+    load_resume_text,
+    parse_resume_to_json,
+)
+from jd_profile import get_jd_profile
+
+POLL_INTERVAL = 0.5
+DEFAULT_PAGE_SIZE = 500
+# Jobs handed to the pool per worker, so a long batch doesn't all sit in its queue
+INFLIGHT_PER_WORKER = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    jd_text TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    batch TEXT NOT NULL REFERENCES batches(id),
+    name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    payload BLOB,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch, status);
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def process_resume(name: str, payload: bytes, jd_text: str) -> Dict[str, Any]:
+    """Worker: extract, parse and score one uploaded file"""
+    upload = io.BytesIO(payload)
+    upload.name = name  # load_resume_text dispatches on the file name
+    raw_text = load_resume_text(upload)
+    parsed = parse_resume_to_json(raw_text)
+    # Compiled once per worker and batch, then served from the JD cache
+    match = compute_skill_match(get_jd_profile(jd_text), raw_text)
+    return {
+        "name": name,
+        "score": match["score"],
+        "overlap": match["overlap"],
+        "missing": match["missing"],
+        "weighted_months": round(compute_weighted_months(parsed.get("experience", [])), 1),
+    }
+
+
+class JobQueue:
+    """SQLite-backed job queue worked by a process pool"""
+
+    def __init__(self, path: str, workers: Optional[int] = None):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        with self._db:
+            # Anything "running" belonged to a pool that no longer exists
+            self._db.execute("UPDATE jobs SET status = 'pending' WHERE status = 'running'")
+        self._lock = threading.Lock()
+
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(self.workers)
+        self._inflight = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def enqueue(self, jd_text: str, files: Iterable[Tuple[str, bytes]]) -> str:
+        """Queue (name, bytes) uploads for scoring against jd_text; returns the batch id"""
+        batch = uuid.uuid4().hex
+        now = _now()
+        with self._lock, self._db:
+            self._db.execute("INSERT INTO batches (id, jd_text, created_at) VALUES (?, ?, ?)", (batch, jd_text, now))
+            self._db.executemany(
+                "INSERT INTO jobs (batch, name, payload, created_at) VALUES (?, ?, ?, ?)",
+                [(batch, name, payload, now) for name, payload in files],
+            )
+        self._wake.set()
+        return batch
+
+    def _claim(self, limit: int) -> List[Tuple[int, str, bytes, str]]:
+        with self._lock, self._db:
+            rows = self._db.execute(
+                "SELECT j.id, j.name, j.payload, b.jd_text FROM jobs j JOIN batches b ON b.id = j.batch "
+                "WHERE j.status = 'pending' ORDER BY j.id LIMIT ?",
+                (limit,),
+            ).fetchall()
+            self._db.executemany("UPDATE jobs SET status = 'running' WHERE id = ?", [(r[0],) for r in rows])
+        return rows
+
+    def _finish(self, job_id: int, future):
+        if future.cancelled():
+            # Cancelled by close(): leave it for the next queue to pick up
+            with self._lock, self._db:
+                self._db.execute("UPDATE jobs SET status = 'pending' WHERE id = ?", (job_id,))
+                self._inflight -= 1
+            return
+        try:
+            result, error = json.dumps(future.result()), None
+        except Exception as exc:
+            result, error = None, f"{type(exc).__name__}: {exc}"
+        with self._lock, self._db:
+            # The file bytes are only needed until the job has run
+            self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, finished_at = ? WHERE id = ?",
+                ("failed" if error else "done", result, error, _now(), job_id),
+            )
+            self._inflight -= 1
+        self._wake.set()
+
+    def _release(self, job_ids: List[int]):
+        with self._lock, self._db:
+            self._db.executemany("UPDATE jobs SET status = 'pending' WHERE id = ?", [(i,) for i in job_ids])
+
+    def _restart_pool(self):
+        # In-flight futures of the broken pool fail or are cancelled through _finish
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = ProcessPoolExecutor(self.workers)
+
+    def _dispatch_loop(self):
+        while not self._stop.is_set():
+            free = self.workers * INFLIGHT_PER_WORKER - self._inflight
+            rows = self._claim(free) if free > 0 else []
+            for n, (job_id, name, payload, jd_text) in enumerate(rows):
+                try:
+                    future = self._pool.submit(process_resume, name, payload, jd_text)
+                except BrokenProcessPool:
+                    # A worker died and took the pool with it
+                    self._release([row[0] for row in rows[n:]])
+                    self._restart_pool()
+                    break
+                with self._lock:
+                    self._inflight += 1
+                future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+            if not rows:
+                self._wake.wait(POLL_INTERVAL)
+                self._wake.clear()
+
+    def progress(self, batch: str) -> Dict[str, int]:
+        """Job counts by status for one batch"""
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs WHERE batch = ? GROUP BY status", (batch,)).fetchall()
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0, **dict(rows)}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def results(self, batch: str, limit: int = -1, offset: int = 0) -> List[Dict[str, Any]]:
+        """Finished results of a batch, best score first (limit -1 means all)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, result FROM jobs WHERE batch = ? AND status = 'done' "
+                "ORDER BY json_extract(result, '$.score') DESC, id LIMIT ? OFFSET ?",
+                (batch, limit, offset),
+            ).fetchall()
+        return [{"id": job_id, **json.loads(result)} for job_id, result in rows]
+
+    def iter_results(self, batch: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Finished results in ranked pages, holding one page in memory at a time.
+
+        Pages continue from the last (score, id) seen rather than an OFFSET,
+        so results that finish mid-export can't shift rows between pages
+        and cause duplicates or gaps.
+        """
+        last_score, last_id = float("inf"), -1
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, result, json_extract(result, '$.score') AS score FROM jobs "
+                    "WHERE batch = ? AND status = 'done' AND (score < ? OR (score = ? AND id > ?)) "
+                    "ORDER BY score DESC, id LIMIT ?",
+                    (batch, last_score, last_score, last_id, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            yield [{"id": job_id, **json.loads(result)} for job_id, result, _ in rows]
+            last_id, _, last_score = rows[-1]
+
+    def failures(self, batch: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, name, error FROM jobs WHERE batch = ? AND status = 'failed' ORDER BY id", (batch,)
+            ).fetchall()
+        return [{"id": r[0], "name": r[1], "error": r[2]} for r in rows]
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._dispatcher.join()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
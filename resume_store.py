@@ -0,0 +1,175 @@
+# resume_store.py - PERSISTENT RESUME LIBRARY
+"""
+Local SQLite store for resumes that outlives Streamlit sessions.
+
+Each resume keeps its raw text and parse_resume_to_json output, plus an FTS5
+row with one column per section. A JD query pulls the best few hundred
+candidates by BM25 straight from the index, and only those are re-ranked
+with the exact compute_skill_match. The query also carries every spelling
+of the taxonomy skills that compute_skill_match would credit, so a
+"golang, k8s" resume is a candidate for a "Go and Kubernetes" JD. The database runs in WAL mode so one
+process can ingest while others query.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app import SKILL_TAXONOMY, compute_skill_match, extract_technical_skills, parse_resume_to_json
+
+DEFAULT_CANDIDATES = 300
+# bm25() column weights, in FTS column order
+FTS_COLUMNS = ("skills", "experience", "projects", "education", "body")
+FTS_WEIGHTS = (3.0, 2.0, 1.5, 0.5, 1.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    sha256 TEXT NOT NULL UNIQUE,
+    raw_text TEXT NOT NULL,
+    parsed_json TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5(
+    skills, experience, projects, education, body,
+    tokenize = "unicode61 tokenchars '+#'"
+);
+"""
+
+
+def section_texts(parsed: Dict[str, Any], raw_text: str) -> Dict[str, str]:
+    """Flatten parsed sections into one string per FTS column"""
+    skills = parsed.get("skills", {})
+    skills = skills.get("all", []) if isinstance(skills, dict) else skills
+    experience = [
+        " ".join([e.get("title", ""), e.get("company", ""), *e.get("bullets", [])])
+        for e in parsed.get("experience", [])
+    ]
+    projects = [" ".join([p.get("title", ""), *p.get("bullets", [])]) for p in parsed.get("projects", [])]
+    education = [
+        " ".join([e.get("institution", ""), e.get("degree", ""), *e.get("courses", [])])
+        for e in parsed.get("education", [])
+    ]
+    return {
+        "skills": ", ".join(skills),
+        "experience": "\n".join(experience),
+        "projects": "\n".join(projects),
+        "education": "\n".join(education),
+        # Raw text too, so resumes without detected headers are still searchable
+        "body": raw_text,
+    }
+
+
+def fts_query(jd) -> str:
+    """OR of the JD skills and crediting taxonomy spellings, each quoted so FTS5 syntax is literal"""
+    if isinstance(jd, str):
+        terms, taxonomy_skills = extract_technical_skills(jd), SKILL_TAXONOMY.skills_in(jd)
+    else:
+        terms, taxonomy_skills = set(jd.skills), jd.taxonomy_skills
+    # Aliases, descendants and related skills (golang, k8s, pytorch for deep learning)
+    for skill in taxonomy_skills:
+        terms = terms | SKILL_TAXONOMY.spellings(SKILL_TAXONOMY.crediting(skill))
+    return " OR ".join('"{}"'.format(s.replace('"', '""')) for s in sorted(terms))
+
+
+class ResumeStore:
+    """SQLite + FTS5 resume library (thread-safe; one connection per store)"""
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def _index(self, resume_id: int, parsed: Dict[str, Any], raw_text: str):
+        sections = section_texts(parsed, raw_text)
+        self._db.execute("DELETE FROM resume_fts WHERE rowid = ?", (resume_id,))
+        self._db.execute(
+            f"INSERT INTO resume_fts (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            (resume_id, *(sections[c] for c in FTS_COLUMNS)),
+        )
+
+    def add(self, name: str, raw_text: str, parsed: Optional[Dict[str, Any]] = None) -> int:
+        """Store a resume (deduplicated by content) and return its id"""
+        sha = hashlib.sha256(raw_text.encode("utf-8")).hexdigest()
+        with self._lock:
+            row = self._db.execute("SELECT id FROM resumes WHERE sha256 = ?", (sha,)).fetchone()
+            if row:
+                return row[0]
+            parsed = parsed if parsed is not None else parse_resume_to_json(raw_text)
+            with self._db:
+                cur = self._db.execute(
+                    "INSERT INTO resumes (name, sha256, raw_text, parsed_json, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (name, sha, raw_text, json.dumps(parsed), datetime.now().isoformat(timespec="seconds")),
+                )
+                self._index(cur.lastrowid, parsed, raw_text)
+            return cur.lastrowid
+
+    def update_parsed(self, resume_id: int, parsed: Dict[str, Any]):
+        """Replace the stored parse (e.g. after user edits) and re-index it"""
+        with self._lock, self._db:
+            row = self._db.execute("SELECT raw_text FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+            if row is None:
+                raise KeyError(resume_id)
+            self._db.execute("UPDATE resumes SET parsed_json = ? WHERE id = ?", (json.dumps(parsed), resume_id))
+            self._index(resume_id, parsed, row[0])
+
+    def get(self, resume_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, name, raw_text, parsed_json, created_at FROM resumes WHERE id = ?", (resume_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"id": row[0], "name": row[1], "raw_text": row[2], "parsed": json.loads(row[3]), "created_at": row[4]}
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute("SELECT id, name, created_at FROM resumes ORDER BY id DESC").fetchall()
+        return [{"id": r[0], "name": r[1], "created_at": r[2]} for r in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def search(self, jd, limit: int = DEFAULT_CANDIDATES) -> List[Dict[str, Any]]:
+        """Top candidates by BM25 over the section index (best first)"""
+        query = fts_query(jd)
+        if not query:
+            return []
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT r.id, r.name, bm25(resume_fts, {weights}) AS rank "
+                "FROM resume_fts JOIN resumes r ON r.id = resume_fts.rowid "
+                "WHERE resume_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        # bm25() is lower-is-better; flip the sign so higher means more relevant
+        return [{"id": r[0], "name": r[1], "bm25": -r[2]} for r in rows]
+
+    def rank(self, jd, top: int = 50, candidates: int = DEFAULT_CANDIDATES) -> List[Dict[str, Any]]:
+        """BM25 candidate retrieval, then exact compute_skill_match re-ranking"""
+        hits = self.search(jd, candidates)
+        if not hits:
+            return []
+        placeholders = ", ".join("?" * len(hits))
+        with self._lock:
+            texts = dict(self._db.execute(
+                f"SELECT id, raw_text FROM resumes WHERE id IN ({placeholders})", [h["id"] for h in hits]
+            ).fetchall())
+
+        ranked = []
+        for hit in hits:
+            match = compute_skill_match(jd, texts[hit["id"]])
+            ranked.append({**hit, "score": match["score"], "overlap": match["overlap"], "missing": match["missing"]})
+        ranked.sort(key=lambda r: (-r["score"], r["id"]))
+        return ranked[:top]
+
+    def close(self):
+        self._db.close()
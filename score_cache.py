@@ -0,0 +1,152 @@
+# score_cache.py - MATCH RESULT CACHE
+"""
+Two-tier cache for compute_skill_match results.
+
+Results are keyed on (resume hash, JD hash, scoring-config fingerprint). The
+fingerprint covers the tokenizer settings (STOPWORDS, KNOWN_SHORT,
+SLASH_COMPOUNDS), SEMANTIC_MAX_FEATURES, the keyword/semantic blend
+weights, the implied, related and fuzzy credits, the loaded skill taxonomy,
+the fuzzy lookup thresholds and MATCHER_VERSION, so changing any of them
+misses every old entry, and stale rows are purged from disk when the cache
+is opened. Fuzzy-stage results are keyed on the fingerprint of the index
+that produced them. The memory tier is an LRU of serialised results; the
+disk tier is a SQLite table.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import app
+import fuzzy
+from app import compute_skill_match
+
+DEFAULT_MEMORY_ENTRIES = 1024
+
+
+def config_fingerprint() -> str:
+    """Hash of everything that can change a match result for the same input"""
+    config = {
+        "stopwords": sorted(app.STOPWORDS),
+        "known_short": sorted(app.KNOWN_SHORT),
+        "slash_compounds": sorted(app.SLASH_COMPOUNDS),
+        "semantic_max_features": app.SEMANTIC_MAX_FEATURES,
+        "fuzzy": [fuzzy.DEFAULT_MAX_DISTANCE, fuzzy.MIN_TOKEN_LENGTH, fuzzy.LONG_TOKEN_LENGTH],
+        "weights": [
+            app.KEYWORD_WEIGHT, app.SEMANTIC_WEIGHT, app.IMPLIED_CREDIT, app.RELATED_CREDIT, app.FUZZY_CREDIT
+        ],
+        "taxonomy": app.SKILL_TAXONOMY.digest,
+        "version": app.MATCHER_VERSION,
+    }
+    return hashlib.sha256(json.dumps(config).encode("utf-8")).hexdigest()[:16]
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _decode(value: str) -> Dict[str, Any]:
+    result = json.loads(value)
+    result["contributions"] = [tuple(c) for c in result.get("contributions", [])]
+    return result
+
+
+class ScoreCache:
+    """In-memory LRU in front of an optional SQLite store"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.fingerprint = config_fingerprint()
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "key TEXT PRIMARY KEY, config TEXT NOT NULL, value TEXT NOT NULL)"
+            )
+            self._db.execute("DELETE FROM scores WHERE config != ?", (self.fingerprint,))
+            self._db.commit()
+
+    def key(self, jd, resume_text: str, fuzzy_index=None) -> str:
+        jd_hash = _sha(jd) if isinstance(jd, str) else jd.text_hash
+        variant = f":fuzzy-{fuzzy_index.fingerprint}" if fuzzy_index is not None else ""
+        return f"{_sha(resume_text)}:{jd_hash}:{self.fingerprint}{variant}"
+
+    def _remember(self, key: str, value: str):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+        while len(self._memory) > self.max_entries:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, jd, resume_text: str, fuzzy_index=None) -> Optional[Dict[str, Any]]:
+        key = self.key(jd, resume_text, fuzzy_index)
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return _decode(value)
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM scores WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._remember(key, row[0])
+                    self.hits["disk"] += 1
+                    return _decode(row[0])
+            self.misses += 1
+        return None
+
+    def put(self, jd, resume_text: str, result: Dict[str, Any], fuzzy_index=None):
+        key = self.key(jd, resume_text, fuzzy_index)
+        value = json.dumps(result)
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO scores (key, config, value) VALUES (?, ?, ?)",
+                    (key, self.fingerprint, value),
+                )
+                self._db.commit()
+
+    def match(self, jd, resume_text: str, fuzzy_index=None) -> Dict[str, Any]:
+        """compute_skill_match, served from the cache when possible"""
+        result = self.get(jd, resume_text, fuzzy_index)
+        if result is None:
+            result = compute_skill_match(jd, resume_text, fuzzy_index)
+            self.put(jd, resume_text, result, fuzzy_index)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.hits["memory"] + self.hits["disk"]
+            lookups = hits + self.misses
+            disk_bytes = 0
+            if self._db is not None:
+                pages = self._db.execute("PRAGMA page_count").fetchone()[0]
+                page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+                disk_bytes = pages * page_size
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": disk_bytes,
+            }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,152 @@
+# section_scoring.py - SECTION-WEIGHTED SCORING
+"""
+Score a JD against the structured (user-edited) resume instead of raw text.
+
+Each section becomes one row of a sparse term matrix: the skills list, every
+experience entry and the projects. Rows carry a weight from their section
+and, for experience, from how recent and how long the role was. The weighted
+rows are collapsed into one term-strength vector once per resume, so scoring
+a new JD is a lookup plus a dot product. Columns are ids in the process-wide
+SKILL_VOCABULARY, so a JD maps to the same columns in every resume.
+
+Each row also keeps its taxonomy skills, and JD tokens a row only has
+under an alias, through an implied skill or through a related one get the
+credit app.match_skill_tokens gives them, as in compute_skill_match.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from app import (
+    IMPLIED_CREDIT,
+    KEYWORD_WEIGHT,
+    RELATED_CREDIT,
+    SEMANTIC_WEIGHT,
+    SKILL_TAXONOMY,
+    SKILL_VOCABULARY,
+    compute_months,
+    extract_skill_ids,
+    extract_technical_skills,
+    match_skill_tokens,
+)
+
+SECTION_WEIGHTS = {"skills": 1.0, "experience": 1.0, "projects": 0.6}
+RECENCY_HALF_LIFE_MONTHS = 36
+TENURE_FULL_CREDIT_MONTHS = 12
+
+
+@dataclass
+class ResumeVectors:
+    """Precomputed per-resume term vectors, reusable across JDs"""
+    labels: List[str]
+    weights: np.ndarray
+    matrix: csr_matrix
+    strength: np.ndarray
+    taxonomy: List[FrozenSet[str]]
+
+
+def experience_weight(exp: Dict[str, Any]) -> float:
+    """Section weight scaled by recency (end_date) and tenure (months)"""
+    end = exp.get("end_date")
+    months_since_end = 0 if not end or end == "Present" else compute_months(end, None)
+    recency = 0.5 ** (months_since_end / RECENCY_HALF_LIFE_MONTHS)
+    months = exp.get("months") or 0
+    tenure = 0.5 + 0.5 * min(1.0, months / TENURE_FULL_CREDIT_MONTHS)
+    return SECTION_WEIGHTS["experience"] * recency * tenure
+
+
+def _section_rows(parsed: Dict[str, Any]):
+    skills = parsed.get("skills", {})
+    skills = skills.get("all", []) if isinstance(skills, dict) else skills
+    if skills:
+        yield "skills", SECTION_WEIGHTS["skills"], " ".join(skills)
+
+    for i, exp in enumerate(parsed.get("experience", [])):
+        text = " ".join([exp.get("title", ""), *exp.get("bullets", [])])
+        label = exp.get("company") or exp.get("title") or f"role {i + 1}"
+        yield f"experience: {label}", experience_weight(exp), text
+
+    projects = parsed.get("projects", [])
+    if projects:
+        text = " ".join(
+            " ".join([p.get("title", ""), *p.get("bullets", [])]) for p in projects
+        )
+        yield "projects", SECTION_WEIGHTS["projects"], text
+
+
+def build_resume_vectors(parsed: Dict[str, Any]) -> ResumeVectors:
+    """Build the per-section term matrix and weighted term strengths"""
+    labels, weights, taxonomy = [], [], []
+    indptr, indices = [0], []
+
+    for label, weight, text in _section_rows(parsed):
+        indices.extend(extract_skill_ids(text).tolist())
+        indptr.append(len(indices))
+        labels.append(label)
+        weights.append(weight)
+        taxonomy.append(frozenset(SKILL_TAXONOMY.skills_in(text)))
+
+    # Ids never change, so later vocabulary growth only adds columns this resume lacks
+    matrix = csr_matrix(
+        (np.ones(len(indices)), indices, indptr),
+        shape=(len(labels), len(SKILL_VOCABULARY)),
+    )
+    weights = np.asarray(weights, dtype=float)
+    # A term mentioned in several sections adds up, capped at full credit
+    strength = np.minimum(matrix.T @ weights, 1.0)
+    return ResumeVectors(labels, weights, matrix, strength, taxonomy)
+
+
+def score_resume_vectors(jd, vectors: ResumeVectors) -> Dict[str, Any]:
+    """Section-weighted skill match against a precomputed resume bundle"""
+    if isinstance(jd, str):
+        jd_skills, jd_taxonomy_skills = extract_technical_skills(jd), SKILL_TAXONOMY.skills_in(jd)
+    else:
+        jd_skills, jd_taxonomy_skills = set(jd.skills), jd.taxonomy_skills
+    if not jd_skills:
+        return {"score": 0, "overlap": [], "missing": [], "sections": {}}
+
+    tokens = sorted(jd_skills)
+    width = len(vectors.strength)
+    ids = np.array([SKILL_VOCABULARY.ids.get(t, width) for t in tokens], dtype=np.intp)
+    known = ids < width
+    # credit[row, j]: how much section row earns for JD token j; verbatim hits come from the matrix
+    credit = np.zeros((len(vectors.labels), len(tokens)))
+    credit[:, known] = vectors.matrix[:, ids[known]].toarray()
+    if jd_taxonomy_skills:
+        column = {t: j for j, t in enumerate(tokens)}
+        matrix = vectors.matrix
+        for row, row_taxonomy in enumerate(vectors.taxonomy):
+            if not row_taxonomy:
+                continue
+            row_skills = {SKILL_VOCABULARY.terms[i] for i in matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]}
+            matched = match_skill_tokens(jd_skills, jd_taxonomy_skills, row_skills, row_taxonomy)
+            for kind, value in (("overlap", 1.0), ("implied", IMPLIED_CREDIT), ("related", RELATED_CREDIT)):
+                for token in matched[kind]:
+                    credit[row, column[token]] = max(credit[row, column[token]], value)
+
+    # A token credited in several sections adds up, capped at full credit
+    matched = np.minimum(vectors.weights @ credit, 1.0)
+    hits = [t for t, m in zip(tokens, matched) if m > 0]
+
+    keyword_pct = matched.sum() / len(jd_skills) * 100
+    resume_norm = np.linalg.norm(vectors.strength)
+    cosine = matched.sum() / (np.sqrt(len(jd_skills)) * resume_norm) if resume_norm else 0.0
+    final_score = keyword_pct * KEYWORD_WEIGHT + cosine * 100 * SEMANTIC_WEIGHT
+
+    # Weighted credit per section, for explaining where the score came from
+    section_hits = credit.sum(axis=1) * vectors.weights
+    sections = {
+        label: round(float(v), 2)
+        for label, v in zip(vectors.labels, section_hits)
+        if v > 0
+    }
+
+    return {
+        "score": round(float(final_score), 2),
+        "overlap": hits,
+        "missing": sorted(jd_skills - set(hits)),
+        "sections": sections,
+    }
@@ -0,0 +1,194 @@
+# session_store.py - SHARED RESUME MEMORY ACROSS SESSIONS
+"""
+Process-wide, content-addressed store for the resumes Streamlit sessions
+are working on.
+
+A session keeps only a small handle (a sha256 of the resume text and its
+parse) in st.session_state; the text and parsed dict live once in this
+store however many sessions uploaded the same file, and are reference
+counted. Derived data attached to a record (section vectors) counts toward
+its size. Sessions that have been idle longer than the TTL are released,
+and when the store grows past its memory ceiling the least recently seen
+sessions are released first. A session whose handle was released must
+upload its resume again.
+
+ATS_MEMORY_CEILING_MB and ATS_SESSION_TTL_MINUTES set the limits per
+deployment.
+"""
+import hashlib
+import json
+import os
+import threading
+import sys
+import time
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Any, Dict, Optional
+
+DEFAULT_CEILING_MB = 512
+DEFAULT_TTL_MINUTES = 30
+
+
+@dataclass
+class ResumeRecord:
+    sha: str
+    text: str
+    parsed: Dict[str, Any]
+    nbytes: int
+    refs: int = 0
+    # Derived data (e.g. section vectors) shared by every session holding the record
+    derived: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SessionHandles:
+    handles: Dict[str, str] = field(default_factory=dict)  # slot -> record sha
+    last_seen: float = 0.0
+
+
+def record_key(text: str, parsed: Dict[str, Any]) -> str:
+    body = json.dumps(parsed, sort_keys=True)
+    return hashlib.sha256(f"{text}\0{body}".encode("utf-8")).hexdigest()
+
+
+def record_size(text: str, parsed: Dict[str, Any]) -> int:
+    """Approximate footprint: UTF-8 text plus the serialised parse"""
+    return len(text.encode("utf-8")) + len(json.dumps(parsed))
+
+
+def derived_size(value: Any) -> int:
+    """Approximate footprint of derived data: array and sparse-matrix buffers, plus containers"""
+    if hasattr(value, "indptr"):  # scipy CSR/CSC
+        return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    if hasattr(value, "nbytes"):  # numpy arrays
+        return int(value.nbytes)
+    if is_dataclass(value):
+        return sum(derived_size(getattr(value, f.name)) for f in fields(value))
+    if isinstance(value, dict):
+        return sum(derived_size(k) + derived_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(derived_size(v) for v in value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return sys.getsizeof(value)
+
+
+class SessionStore:
+    """Reference-counted resume records behind per-session handles"""
+
+    def __init__(self, ceiling_bytes: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        if ceiling_bytes is None:
+            ceiling_bytes = int(float(os.environ.get("ATS_MEMORY_CEILING_MB", DEFAULT_CEILING_MB)) * 2 ** 20)
+        if ttl_seconds is None:
+            ttl_seconds = float(os.environ.get("ATS_SESSION_TTL_MINUTES", DEFAULT_TTL_MINUTES)) * 60
+        self.ceiling_bytes = ceiling_bytes
+        self.ttl_seconds = ttl_seconds
+        self._records: Dict[str, ResumeRecord] = {}
+        self._sessions: Dict[str, SessionHandles] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evicted = {"idle": 0, "ceiling": 0}
+
+    def touch(self, session_id: str):
+        with self._lock:
+            self._sessions.setdefault(session_id, SessionHandles()).last_seen = time.monotonic()
+
+    def _unref(self, sha: str):
+        record = self._records[sha]
+        record.refs -= 1
+        if record.refs == 0:
+            del self._records[sha]
+            self._bytes -= record.nbytes
+
+    def _drop_session(self, session_id: str):
+        for sha in self._sessions.pop(session_id).handles.values():
+            self._unref(sha)
+
+    def put(self, session_id: str, slot: str, text: str, parsed: Dict[str, Any]) -> ResumeRecord:
+        """Point the session's slot at (text, parsed), storing it once per content"""
+        sha = record_key(text, parsed)
+        with self._lock:
+            session = self._sessions.setdefault(session_id, SessionHandles())
+            session.last_seen = time.monotonic()
+            record = self._records.get(sha)
+            if record is None:
+                record = ResumeRecord(sha, text, parsed, record_size(text, parsed))
+                self._records[sha] = record
+                self._bytes += record.nbytes
+            if session.handles.get(slot) != sha:
+                record.refs += 1
+                old = session.handles.get(slot)
+                session.handles[slot] = sha
+                if old is not None:
+                    self._unref(old)
+            self._enforce_ceiling(keep=session_id)
+            return record
+
+    def get(self, session_id: str, slot: str) -> Optional[ResumeRecord]:
+        """The session's record for slot, or None if it was never set or was evicted"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or slot not in session.handles:
+                return None
+            session.last_seen = time.monotonic()
+            return self._records[session.handles[slot]]
+
+    def attach(self, session_id: str, slot: str, key: str, value: Any) -> Optional[ResumeRecord]:
+        """Store derived data on the session's record, counting it toward the ceiling"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or slot not in session.handles:
+                return None
+            record = self._records[session.handles[slot]]
+            size = derived_size(value)
+            old = record.derived.get(key)
+            if old is not None:
+                size -= derived_size(old)
+            record.derived[key] = value
+            record.nbytes += size
+            self._bytes += size
+            self._enforce_ceiling(keep=session_id)
+            return record
+
+    def release(self, session_id: str):
+        with self._lock:
+            if session_id in self._sessions:
+                self._drop_session(session_id)
+
+    def _enforce_ceiling(self, keep: str):
+        # Oldest sessions first; the caller's own session is never evicted
+        by_age = sorted(self._sessions.items(), key=lambda item: item[1].last_seen)
+        for session_id, _ in by_age:
+            if self._bytes <= self.ceiling_bytes:
+                break
+            if session_id != keep:
+                self._drop_session(session_id)
+                self.evicted["ceiling"] += 1
+
+    def sweep(self) -> int:
+        """Release sessions idle longer than the TTL; returns how many"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._lock:
+            idle = [sid for sid, s in self._sessions.items() if s.last_seen < cutoff]
+            for session_id in idle:
+                self._drop_session(session_id)
+            self.evicted["idle"] += len(idle)
+        return len(idle)
+
+    def session_bytes(self, session_id: str) -> float:
+        """Memory attributable to a session (shared records split by reference count)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return 0.0
+            return sum(self._records[sha].nbytes / self._records[sha].refs for sha in session.handles.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "records": len(self._records),
+                "bytes": self._bytes,
+                "ceiling_bytes": self.ceiling_bytes,
+                "evicted_idle": self.evicted["idle"],
+                "evicted_ceiling": self.evicted["ceiling"],
+            }
@@ -1,36 +1,199 @@
 # streamlit_app.py - UPDATED WITH WEIGHTED CALCULATION
 import streamlit as st
 import json
+import os
+import uuid
 from typing import List
 
 from app import (
     load_resume_text,
     parse_resume_to_json,
-    compute_skill_match,
-    extract_min_years,
     estimate_seniority,
+    compute_weighted_months,
+    RELATED_CREDIT,
 )
+from jd_profile import get_jd_profile
+from job_queue import JobQueue
+from resume_store import ResumeStore
+from export import write_csv, write_parquet
+from fuzzy import build_skill_index
+from score_cache import ScoreCache
+from section_scoring import build_resume_vectors, score_resume_vectors
+from session_store import SessionStore
 
 st.set_page_config(page_title="ATS Resume Matcher", layout="centered")
 st.title("ATS Resume Matcher")
 
+SCORE_CACHE_PATH = os.environ.get("ATS_SCORE_CACHE", ".ats_cache/scores.sqlite")
+
+
+@st.cache_resource
+def get_score_cache():
+    """One match-result cache shared by every session of this server"""
+    os.makedirs(os.path.dirname(SCORE_CACHE_PATH) or ".", exist_ok=True)
+    return ScoreCache(SCORE_CACHE_PATH)
+
+
+@st.cache_resource
+def get_fuzzy_index():
+    """Typo-tolerant skill index, built once per server"""
+    return build_skill_index()
+
+RESUME_STORE_PATH = os.environ.get("ATS_RESUME_STORE", ".ats_cache/resumes.sqlite")
+
+
+@st.cache_resource
+def get_resume_store():
+    """Persistent resume library shared by every session of this server"""
+    os.makedirs(os.path.dirname(RESUME_STORE_PATH) or ".", exist_ok=True)
+    return ResumeStore(RESUME_STORE_PATH)
+
+
+JOB_QUEUE_PATH = os.environ.get("ATS_JOB_QUEUE", ".ats_cache/jobs.sqlite")
+BULK_REFRESH_SECONDS = 2
+BULK_PAGE_SIZE = 50
+EXPORT_DIR = os.path.join(os.path.dirname(JOB_QUEUE_PATH) or ".", "exports")
+
+
+@st.cache_resource
+def get_job_queue():
+    """Background parse/score queue; its process pool lives as long as the server"""
+    os.makedirs(os.path.dirname(JOB_QUEUE_PATH) or ".", exist_ok=True)
+    return JobQueue(JOB_QUEUE_PATH)
+
+
+@st.cache_resource
+def get_session_store():
+    """Resume text and parses shared by every session; sessions keep handles only"""
+    return SessionStore()
+
+
+resume_store = get_resume_store()
+job_queue = get_job_queue()
+session_store = get_session_store()
+session_store.sweep()
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+session_store.touch(session_id)
+
+
+def set_resume(raw_text, parsed):
+    """Point this session at a resume; identical content is stored once server-wide"""
+    record = session_store.put(session_id, "resume", raw_text, parsed)
+    st.session_state["resume_sha"] = record.sha
+    return record
+
+
+@st.fragment(run_every=BULK_REFRESH_SECONDS)
+def show_bulk_progress(batch):
+    """Re-runs on its own timer, so the rest of the page is never blocked"""
+    counts = job_queue.progress(batch)
+    finished = counts["done"] + counts["failed"]
+    st.progress(
+        finished / counts["total"] if counts["total"] else 1.0,
+        text=f"{finished}/{counts['total']} processed ({counts['running']} running, {counts['failed']} failed)",
+    )
+    if counts["done"]:
+        pages = max(1, -(-counts["done"] // BULK_PAGE_SIZE))
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="bulk_page")
+        results = job_queue.results(batch, limit=BULK_PAGE_SIZE, offset=(page - 1) * BULK_PAGE_SIZE)
+        # Click a column header to re-sort this page
+        st.dataframe(
+            [
+                {
+                    "Rank": (page - 1) * BULK_PAGE_SIZE + i + 1,
+                    "Resume": r["name"],
+                    "Score": r["score"],
+                    "Matched": len(r["overlap"]),
+                    "Missing": len(r["missing"]),
+                    "Weighted Months": r["weighted_months"],
+                }
+                for i, r in enumerate(results)
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+        cols = st.columns(2)
+        export_format = cols[0].selectbox("Export format", ["CSV", "Parquet"], key="bulk_export_format")
+        if cols[1].button("📤 Export Ranking"):
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            path = os.path.join(EXPORT_DIR, f"{batch}.{export_format.lower()}")
+            writer = write_csv if export_format == "CSV" else write_parquet
+            try:
+                writer(job_queue.iter_results(batch), path)
+                st.session_state["bulk_export"] = path
+            except ImportError as exc:
+                st.error(f"❌ {exc}")
+        export_path = st.session_state.get("bulk_export")
+        if export_path and os.path.exists(export_path) and os.path.basename(export_path).startswith(batch):
+            with open(export_path, "rb") as f:
+                st.download_button("⬇️ Download Export", f, file_name=os.path.basename(export_path))
+    for failure in job_queue.failures(batch):
+        st.caption(f"⚠️ {failure['name']}: {failure['error']}")
+
+# ---------- Resume Library ----------
+with st.sidebar:
+    st.header("📚 Resume Library")
+    library = resume_store.list()
+    st.caption(f"{len(library)} stored resumes")
+    if library:
+        choice = st.selectbox(
+            "Stored resumes",
+            options=[r["id"] for r in library],
+            format_func=lambda rid: next(r["name"] for r in library if r["id"] == rid),
+        )
+        if st.button("📂 Load from Library"):
+            record = resume_store.get(choice)
+            set_resume(record["raw_text"], record["parsed"])
+            st.session_state["resume_id"] = record["id"]
+
+    memory = session_store.stats()
+    st.caption(
+        f"Memory: {session_store.session_bytes(session_id) / 1024:.1f} KB this session · "
+        f"{memory['bytes'] / 2 ** 20:.1f}/{memory['ceiling_bytes'] / 2 ** 20:.0f} MB shared "
+        f"across {memory['sessions']} sessions"
+    )
+
+# ---------- Bulk Ranking ----------
+with st.expander("📦 Bulk Ranking", expanded="bulk_batch" in st.session_state):
+    bulk_files = st.file_uploader(
+        "Upload many resumes", type=["pdf", "docx", "txt"], accept_multiple_files=True, key="bulk_files"
+    )
+    bulk_jd = st.text_area("Job description for this batch", height=150, key="bulk_jd")
+    if st.button("📥 Queue for Scoring"):
+        if not bulk_files or not bulk_jd.strip():
+            st.error("❌ Add at least one resume and a job description.")
+        else:
+            st.session_state["bulk_batch"] = job_queue.enqueue(
+                bulk_jd, [(f.name, f.getvalue()) for f in bulk_files]
+            )
+    if "bulk_batch" in st.session_state:
+        show_bulk_progress(st.session_state["bulk_batch"])
+
 # ---------- Upload ----------
 st.header("Step 1: Upload Resume")
 resume_file = st.file_uploader("Upload PDF, DOCX or TXT", type=["pdf", "docx", "txt"])
 
-if resume_file:
+# Parse each upload once, not on every rerun while it sits in the widget
+if resume_file and st.session_state.get("upload_id") != resume_file.file_id:
     raw_text = load_resume_text(resume_file)
     parsed = parse_resume_to_json(raw_text)
-    st.session_state["parsed_resume"] = parsed
-    st.session_state["resume_text"] = raw_text
-    st.success("✅ Resume parsed. Review and edit below.")
+    set_resume(raw_text, parsed)
+    st.session_state["upload_id"] = resume_file.file_id
+    st.session_state["resume_id"] = resume_store.add(resume_file.name, raw_text, parsed)
+    st.success("✅ Resume parsed and saved to the library. Review and edit below.")
 
 # Require parsed resume to proceed
-if "parsed_resume" not in st.session_state:
+resume = session_store.get(session_id, "resume")
+if resume is None:
+    if "resume_sha" in st.session_state:
+        st.warning("⏳ This session was idle, so its resume was released to free server memory. Please upload it again or load it from the library.")
+        del st.session_state["resume_sha"]
+        st.session_state.pop("upload_id", None)
     st.info("📤 Upload a resume to begin parsing and editing.")
     st.stop()
 
-parsed = st.session_state["parsed_resume"]
+parsed = resume.parsed
 
 # ---------- Experience ----------
 st.header("📋 Experience")
@@ -213,14 +376,18 @@ if st.button("💾 Save Parsed Resume", type="primary", use_container_width=True
         "projects": edited_projects,
         "skills": {"all": edited_skills},
     }
-    st.session_state["parsed_resume"] = new_parsed
+    resume = set_resume(resume.text, new_parsed)
+    if "vectors" not in resume.derived:
+        session_store.attach(session_id, "resume", "vectors", build_resume_vectors(new_parsed))
+    if "resume_id" in st.session_state:
+        resume_store.update_parsed(st.session_state["resume_id"], new_parsed)
 
     # ========================================
     # WEIGHTED MONTHS CALCULATION
     # ========================================
     # Formula: FT * 1.0 + PT * 0.6 + INT * 0.8
     
-    total_weighted = 0.0
+    total_weighted = compute_weighted_months(edited_exps)
     ft_months = 0
     pt_months = 0
     int_months = 0
@@ -231,15 +398,10 @@ if st.button("💾 Save Parsed Resume", type="primary", use_container_width=True
         
         if emp_type == "FT":
             ft_months += months
-            weight = 1.0
         elif emp_type == "INT":
             int_months += months
-            weight = 0.8
         else:  # PT
             pt_months += months
-            weight = 0.6
-        
-        total_weighted += months * weight
     
     st.session_state["weighted_months"] = total_weighted
     st.session_state["ft_months"] = ft_months
@@ -287,24 +449,53 @@ jd_text = st.text_area(
     placeholder="Paste the full job description including requirements, responsibilities, and qualifications..."
 )
 
+if st.button("🔎 Rank Library Against JD", use_container_width=True):
+    if not jd_text.strip():
+        st.error("❌ Please paste a job description!")
+    else:
+        ranked = resume_store.rank(get_jd_profile(jd_text), top=50)
+        if ranked:
+            st.dataframe(
+                [
+                    {"Resume": r["name"], "Score": r["score"], "Matched": len(r["overlap"]), "Missing": len(r["missing"])}
+                    for r in ranked
+                ],
+                use_container_width=True,
+            )
+        else:
+            st.info("No stored resumes mention any of the JD skills.")
+
+fuzzy_enabled = st.checkbox(
+    "Tolerate typos in skill names",
+    help="Count misspelt or versioned skills (e.g. 'pytoch', 'tensorflow2') as matches"
+)
+
 if st.button("🚀 Analyze Match", type="primary", use_container_width=True):
-    if "parsed_resume" not in st.session_state:
-        st.error("❌ Please save your parsed resume first!")
-        st.stop()
-    
     if not jd_text.strip():
         st.error("❌ Please paste a job description!")
         st.stop()
 
-    parsed_resume = st.session_state["parsed_resume"]
-    resume_text = st.session_state.get("resume_text", "")
+    parsed_resume = resume.parsed
+    resume_text = resume.text
     
+    # Compile the JD once; reruns with the same JD hit the cache
+    jd_profile = get_jd_profile(jd_text)
+
     # Compute skill match
-    match_details = compute_skill_match(jd_text, resume_text)
+    score_cache = get_score_cache()
+    fuzzy_index = get_fuzzy_index() if fuzzy_enabled else None
+    match_details = score_cache.match(jd_profile, resume_text, fuzzy_index)
     skills_pct = match_details["score"]
+
+    # Section-weighted match over the edited, structured resume
+    vectors = resume.derived.get("vectors")
+    if vectors is None:
+        vectors = build_resume_vectors(parsed_resume)
+        session_store.attach(session_id, "resume", "vectors", vectors)
+    section_match = score_resume_vectors(jd_profile, vectors)
     
     # Extract JD requirements
-    min_years = extract_min_years(jd_text)
+    min_years = jd_profile.min_years
     min_months_required = min_years * 12
     
     # Get weighted months
@@ -393,9 +584,79 @@ if st.button("🚀 Analyze Match", type="primary", use_container_width=True):
             # Show in a nice format
             missing_text = ", ".join(missing)
             st.text_area("", missing_text, height=200, key="missing", disabled=True)
+            if jd_profile.preferred:
+                missing_required = [m for m in missing if m in jd_profile.required]
+                missing_preferred = [m for m in missing if m in jd_profile.preferred]
+                st.caption(f"Required: {', '.join(missing_required) or 'none'}")
+                st.caption(f"Preferred: {', '.join(missing_preferred) or 'none'}")
         else:
             st.success("No missing skills!")
-    
+
+    implied = match_details.get("skill_matches", {}).get("implied", {})
+    if implied:
+        st.markdown("### 🧩 Implied Skills")
+        st.caption("JD skills not named in your resume but demonstrated by more specific skills you list")
+        st.table([
+            {"JD Skill": skill, "Implied By": ", ".join(sources)}
+            for skill, sources in implied.items()
+        ])
+
+    related = match_details.get("skill_matches", {}).get("related", {})
+    if related:
+        st.markdown("### 🔗 Related Skills")
+        st.caption(f"JD skills close to ones you list; these earn {RELATED_CREDIT:.0%} of a full match")
+        st.table([
+            {"JD Skill": skill, "Related To": ", ".join(sources)}
+            for skill, sources in related.items()
+        ])
+
+    fuzzy_matches = match_details.get("fuzzy", {})
+    if fuzzy_matches:
+        st.markdown("### ✏️ Fuzzy Matches")
+        st.caption("JD skills your resume spells differently; worth fixing so every ATS sees them")
+        st.table([{"JD Skill": skill, "Resume Spelling": token} for skill, token in fuzzy_matches.items()])
+
+    # Score breakdown
+    breakdown = match_details.get("breakdown", {})
+    st.markdown("### 🔍 Score Breakdown")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            "Keyword Match",
+            f"{breakdown.get('keyword', 0)} pts",
+            help="JD skills found in your resume (70% of the score)"
+        )
+    with col2:
+        st.metric(
+            "Semantic Similarity",
+            f"{breakdown.get('semantic', 0)} pts",
+            help="TF-IDF cosine similarity with the JD (30% of the score)"
+        )
+
+    contributions = match_details.get("contributions", [])
+    if contributions:
+        st.caption("Top terms driving the semantic similarity:")
+        st.table([{"Term": term, "Points": points} for term, points in contributions])
+
+    st.metric(
+        "Section-weighted Match",
+        f"{section_match['score']}%",
+        help="JD skills found in your edited resume, directly or through related skills as in Skills Match, weighted by section and by how recent each role is"
+    )
+    if section_match["sections"]:
+        with st.expander("📂 Credit by Section"):
+            st.table([
+                {"Section": label, "Weighted Hits": hits}
+                for label, hits in section_match["sections"].items()
+            ])
+
+    cache_stats = score_cache.stats()
+    st.caption(
+        f"Score cache: {cache_stats['hit_ratio']:.0%} hit ratio, "
+        f"{cache_stats['memory_bytes'] / 1024:.1f} KB in memory, "
+        f"{cache_stats['disk_bytes'] / 1024:.1f} KB on disk"
+    )
+
     st.markdown("---")
     
     # Recommendations
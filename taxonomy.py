@@ -0,0 +1,169 @@
+# taxonomy.py - HIERARCHICAL SKILL GRAPH
+"""
+Skill graph with parent, child and related edges, loaded from a JSON file.
+
+Each skill gets one bit. When the graph is loaded, the transitive closure of
+"having skill s also demonstrates..." is precomputed into one integer bitset
+per skill: s itself and all of its ancestors. Related skills (one hop) get
+a separate bitset, since knowing scala is a hint of spark, not proof of it.
+A resume's closure is the OR of its skills' bitsets, so checking a JD's
+requirements is a few bitwise ANDs.
+
+File format ({skill: {...}}, all keys optional):
+    "pytorch": {"parents": ["deep learning"], "children": [],
+                "related": ["tensorflow"], "aliases": ["py-torch"],
+                "context_aliases": ["torch"]}
+
+context_aliases are spellings that are also ordinary words or names (bert,
+container, node). They only count on a line of text that names some
+taxonomy skill through an unambiguous spelling, so "References: Bert
+Jones" is not read as transformers.
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+
+
+class SkillTaxonomy:
+    def __init__(self, graph: Dict[str, Dict[str, List[str]]]):
+        # Identifies the graph in cache keys (score_cache.config_fingerprint)
+        self.digest = hashlib.sha256(json.dumps(graph, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        names = set()
+        for skill, node in graph.items():
+            names.add(skill.lower())
+            for key in ("parents", "children", "related"):
+                names.update(s.lower() for s in node.get(key, []))
+        self.skills = sorted(names)
+        self.bit = {s: i for i, s in enumerate(self.skills)}
+
+        parents = {s: set() for s in self.skills}
+        related = {s: set() for s in self.skills}
+        aliases = {s: s for s in self.skills}
+        for skill, node in graph.items():
+            skill = skill.lower()
+            parents[skill].update(p.lower() for p in node.get("parents", []))
+            for child in node.get("children", []):
+                parents[child.lower()].add(skill)
+            for other in node.get("related", []):
+                related[skill].add(other.lower())
+                related[other.lower()].add(skill)
+            for alias in node.get("aliases", []):
+                aliases[alias.lower()] = skill
+        self.aliases = aliases
+        self.context_aliases = {
+            alias.lower(): skill.lower()
+            for skill, node in graph.items()
+            for alias in node.get("context_aliases", [])
+        }
+
+        # Ancestor closure: iterate to a fixed point (handles any DAG order)
+        ancestors = {s: 1 << self.bit[s] for s in self.skills}
+        changed = True
+        while changed:
+            changed = False
+            for s in self.skills:
+                mask = ancestors[s]
+                for p in parents[s]:
+                    mask |= ancestors[p]
+                if mask != ancestors[s]:
+                    ancestors[s] = mask
+                    changed = True
+
+        self.implies = [ancestors[s] for s in self.skills]
+        self.related = [self.mask(related[s]) for s in self.skills]
+
+        self._pattern = _term_pattern(aliases)
+        self._context_pattern = _term_pattern(self.context_aliases) if self.context_aliases else None
+
+    @classmethod
+    def load(cls, path: str = TAXONOMY_PATH) -> "SkillTaxonomy":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def skills_in(self, text: str) -> set:
+        """Canonical taxonomy skills mentioned in the text"""
+        text = text.lower()
+        found = {self.aliases[m] for m in self._pattern.findall(text)}
+        if self._context_pattern is not None and self._context_pattern.search(text):
+            for line in text.splitlines():
+                hits = self._context_pattern.findall(line)
+                if hits and self._pattern.search(line):
+                    found.update(self.context_aliases[h] for h in hits)
+        return found
+
+    def mask(self, skills: Iterable[str]) -> int:
+        m = 0
+        for s in skills:
+            m |= 1 << self.bit[s]
+        return m
+
+    def closure(self, skills: Iterable[str]) -> int:
+        """Bitset of everything the given skills demonstrate"""
+        m = 0
+        for s in skills:
+            m |= self.implies[self.bit[s]]
+        return m
+
+    def related_to(self, skills: Iterable[str]) -> int:
+        """Bitset of the skills one related edge away from the given skills"""
+        m = 0
+        for s in skills:
+            m |= self.related[self.bit[s]]
+        return m
+
+    def crediting(self, skill: str) -> List[str]:
+        """Skills that earn credit for skill in match(): itself, its descendants, its related skills"""
+        bit = self.bit[skill]
+        return [s for s in self.skills if (self.implies[self.bit[s]] | self.related[self.bit[s]]) >> bit & 1]
+
+    def spellings(self, skills: Iterable[str]) -> set:
+        """Every name, alias and context alias of the given skills"""
+        skills = set(skills)
+        return {
+            spelling
+            for table in (self.aliases, self.context_aliases)
+            for spelling, skill in table.items()
+            if skill in skills
+        }
+
+    def names(self, mask: int) -> List[str]:
+        return [s for s in self.skills if mask >> self.bit[s] & 1]
+
+    def match(self, jd_skills: Iterable[str], resume_skills: Iterable[str]) -> Dict[str, object]:
+        """Direct, implied and related taxonomy matches of resume skills against JD skills.
+
+        Both sides are canonical names, as returned by skills_in(text).
+        implied maps each JD skill the resume only has implicitly to the
+        resume skills that imply it; related does the same for JD skills
+        that are only one related edge away from a resume skill.
+        """
+        resume_skills = set(resume_skills)
+        jd_mask = self.mask(jd_skills)
+        resume_mask = self.mask(resume_skills)
+
+        direct = jd_mask & resume_mask
+        implied = jd_mask & self.closure(resume_skills) & ~resume_mask
+        related = jd_mask & self.related_to(resume_skills) & ~direct & ~implied
+        return {
+            "direct": self.names(direct),
+            "implied": {
+                skill: sorted(s for s in resume_skills if self.implies[self.bit[s]] >> self.bit[skill] & 1)
+                for skill in self.names(implied)
+            },
+            "related": {
+                skill: sorted(s for s in resume_skills if self.related[self.bit[s]] >> self.bit[skill] & 1)
+                for skill in self.names(related)
+            },
+            "missing": self.names(jd_mask & ~direct & ~implied & ~related),
+        }
+
+
+def _term_pattern(terms: Iterable[str]) -> "re.Pattern":
+    # Longest names first so "deep learning" wins over "learning"-like aliases
+    ordered = sorted(terms, key=len, reverse=True)
+    # No match right after a dot, so "js" is not found inside "node.js"
+    return re.compile(r"(?<![a-z0-9+#.])(?:" + "|".join(re.escape(t) for t in ordered) + r")(?![a-z0-9+#])")
@@ -0,0 +1,95 @@
+# conftest.py - shared fixtures for the golden and budget tests
+"""
+Builds the test corpus: the four resumes in sample.json, rendered as the
+plain text an upload would produce, plus deterministic synthetic variants
+of them. "Present" dates are resolved against a frozen clock so golden
+files don't drift with the calendar.
+"""
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+UPDATE_GOLDEN = os.environ.get("UPDATE_GOLDEN") == "1"
+FROZEN_NOW = datetime(2025, 6, 1)
+SECTION_ORDER = ("experience", "education", "projects", "skills")
+
+JDS = {
+    "ml_engineer": """Senior Machine Learning Engineer
+Requirements:
+- 3+ years of experience with Python, PyTorch and deep learning
+- Experience with AWS, Docker, Kubernetes and CI/CD
+Preferred:
+- Node.js, C++, Spark, Airflow
+- Familiarity with NLP and LLMs, FastAPI
+""",
+    "devops": """DevOps Engineer
+Requirements:
+- 5+ years running Kubernetes and Terraform on AWS or GCP
+- CI/CD with Jenkins or GitHub Actions, Prometheus and Grafana monitoring
+Preferred:
+- Ansible, Helm, Python or Go scripting
+""",
+}
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(app, "datetime", FrozenDatetime)
+
+
+def render(sections, order=SECTION_ORDER):
+    """Resume text with one header line per section, as a parser would see it"""
+    parts = []
+    for name in order:
+        parts.append(name.capitalize())
+        parts.append(sections[name])
+    return "\n".join(parts)
+
+
+def load_sample():
+    with open(os.path.join(ROOT, "sample.json"), encoding="utf-8") as f:
+        return {name.replace(".json", ""): sections for name, sections in json.load(f).items()}
+
+
+def build_corpus():
+    """case name -> resume text (sample resumes, then synthetic variants)"""
+    sample = load_sample()
+    corpus = {name: render(sections) for name, sections in sample.items()}
+    names = sorted(sample)
+    for name in names:
+        sections = sample[name]
+        corpus[f"{name}__reordered"] = render(sections, ("skills", "projects", "experience", "education"))
+        corpus[f"{name}__uppercase"] = render(sections).upper()
+        corpus[f"{name}__no_skills"] = render(sections, ("experience", "education", "projects"))
+        corpus[f"{name}__bullets"] = render(sections).replace("\n- ", "\n• ")
+    # Two resumes merged, as when a candidate pastes a second CV in
+    corpus["merged"] = render(sample[names[0]]) + "\n" + render(sample[names[1]])
+    corpus["empty"] = ""
+    # Slash-joined skills: only allowlisted compounds stay whole
+    corpus["slash_compounds"] = render({
+        "experience": "Data Engineer 2019/2020\n- Built pipelines on AWS/GCP with Python/Spark",
+        "education": "B.Sc. Statistics",
+        "projects": "- Analytics in R/SAS, services in C/C++, deployed via CI/CD.",
+        "skills": "UI/UX, TCP/IP, PL/SQL, A/B testing, Node.js/TypeScript",
+    })
+    return corpus
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    return build_corpus()
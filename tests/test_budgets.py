@@ -0,0 +1,77 @@
+# test_budgets.py - per-stage time and memory budgets
+"""
+Fails when a stage gets markedly slower or hungrier on the test corpus.
+
+Time is the best of TIME_ROUNDS passes over the corpus, per document.
+Memory is the largest tracemalloc peak of a single call above what was
+allocated before it. Budgets sit at roughly 4-5x what the stages measured
+when they were set (0.3 / 0.9 / 0.16 / 4.8 ms and 23 / 81 / 99 / 140 KB,
+one CPU), so only real regressions trip them; lower a budget after a
+speedup lands. PERF_BUDGET_SCALE=2 loosens every budget on a slow machine.
+"""
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from conftest import JDS
+
+import app
+import resume_parser
+
+TIME_ROUNDS = 5
+BUDGET_SCALE = float(os.environ.get("PERF_BUDGET_SCALE", "1"))
+
+# stage -> (ms per document, peak KB per call)
+BUDGETS = {
+    "parse_resume_to_json": (2.0, 128),
+    "parse_resume_text": (5.0, 384),
+    "extract_technical_skills": (1.0, 384),
+    "compute_skill_match": (25.0, 640),
+}
+
+STAGES = {
+    "parse_resume_to_json": app.parse_resume_to_json,
+    "parse_resume_text": resume_parser.parse_resume_text,
+    "extract_technical_skills": app.extract_technical_skills,
+    "compute_skill_match": lambda text: app.compute_skill_match(JDS["ml_engineer"], text),
+}
+
+
+def per_doc_ms(stage, texts):
+    best = float("inf")
+    for _ in range(TIME_ROUNDS):
+        start = time.perf_counter()
+        for text in texts:
+            stage(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1000
+
+
+def peak_kb(stage, texts):
+    worst = 0
+    tracemalloc.start()
+    try:
+        for text in texts:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            stage(text)
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return worst / 1024
+
+
+@pytest.mark.parametrize("name", sorted(STAGES))
+def test_stage_budget(corpus, name):
+    stage, texts = STAGES[name], list(corpus.values())
+    for text in texts:  # warm regex, vectorizer and taxonomy caches
+        stage(text)
+    ms_budget, kb_budget = BUDGETS[name]
+
+    ms = per_doc_ms(stage, texts)
+    assert ms <= ms_budget * BUDGET_SCALE, f"{name}: {ms:.2f} ms/doc over the {ms_budget} ms budget"
+
+    kb = peak_kb(stage, texts)
+    assert kb <= kb_budget * BUDGET_SCALE, f"{name}: {kb:.0f} KB peak over the {kb_budget} KB budget"
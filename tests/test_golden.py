@@ -0,0 +1,80 @@
+# test_golden.py - frozen outputs of the parsers and the matcher
+"""
+Each stage's output for every corpus case is compared with a JSON file
+under tests/golden/<stage>/. Strings, lists and integers must match
+exactly; floats (scores, breakdown points, term contributions) may move by
+SCORE_TOLERANCE. After an intended change, regenerate with:
+
+    UPDATE_GOLDEN=1 python -m pytest -q tests/test_golden.py
+"""
+import json
+import math
+import os
+
+import pytest
+
+from conftest import GOLDEN_DIR, JDS, UPDATE_GOLDEN, build_corpus
+
+import app
+import resume_parser
+
+SCORE_TOLERANCE = 0.05
+CASES = sorted(build_corpus())
+
+
+def _plain(value):
+    """JSON round trip, so tuples, numpy floats and sets compare like the file"""
+    return json.loads(json.dumps(value, default=sorted))
+
+
+def _assert_close(actual, expected, where):
+    if isinstance(expected, float) or isinstance(actual, float):
+        assert isinstance(actual, (int, float)) and isinstance(expected, (int, float)), where
+        assert math.isclose(actual, expected, abs_tol=SCORE_TOLERANCE), f"{where}: {actual} != {expected}"
+    elif isinstance(expected, dict):
+        assert isinstance(actual, dict) and actual.keys() == expected.keys(), f"{where}: keys differ"
+        for key in expected:
+            _assert_close(actual[key], expected[key], f"{where}.{key}")
+    elif isinstance(expected, list):
+        assert isinstance(actual, list) and len(actual) == len(expected), f"{where}: length differs"
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            _assert_close(a, e, f"{where}[{i}]")
+    else:
+        assert actual == expected, f"{where}: {actual!r} != {expected!r}"
+
+
+def check_golden(stage, case, actual):
+    path = os.path.join(GOLDEN_DIR, stage, f"{case}.json")
+    actual = _plain(actual)
+    if UPDATE_GOLDEN:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(actual, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return
+    if not os.path.exists(path):
+        pytest.fail(f"no golden file {path}; run with UPDATE_GOLDEN=1 to create it")
+    with open(path, encoding="utf-8") as f:
+        expected = json.load(f)
+    _assert_close(actual, expected, f"{stage}/{case}")
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_parse_resume_to_json(corpus, case):
+    check_golden("parse_resume_to_json", case, app.parse_resume_to_json(corpus[case]))
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_parse_resume_text(corpus, case):
+    check_golden("parse_resume_text", case, resume_parser.parse_resume_text(corpus[case]))
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_extract_technical_skills(corpus, case):
+    check_golden("extract_technical_skills", case, sorted(app.extract_technical_skills(corpus[case])))
+
+
+@pytest.mark.parametrize("jd", sorted(JDS))
+@pytest.mark.parametrize("case", CASES)
+def test_compute_skill_match(corpus, case, jd):
+    check_golden("compute_skill_match", f"{jd}__{case}", app.compute_skill_match(JDS[jd], corpus[case]))
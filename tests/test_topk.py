@@ -0,0 +1,39 @@
+# test_topk.py - pruned top-k against the exhaustive reference
+"""
+TopKIndex.top_k must return exactly what scoring every resume with
+batch.score_text returns, for any k and for any taxonomy credit settings.
+Resumes and JDs are drawn at random from skill names, aliases and filler.
+"""
+import random
+
+import pytest
+
+import app
+import topk
+from topk import TopKIndex
+
+WORDS = (
+    "python pytorch tensorflow keras scala spark pyspark airflow kafka golang go kubernetes k8s "
+    "docker helm terraform aws gcp ec2 sagemaker pandas numpy sql postgres mysql react node.js "
+    "nlp llm transformers deep learning machine statistics java c++ rust linux grafana prometheus "
+    "team built shipped pipelines customers reports mentoring delivered platform"
+).split()
+
+
+def random_text(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+@pytest.mark.parametrize("implied_credit", [1.0, 0.5])
+@pytest.mark.parametrize("seed", range(4))
+def test_top_k_matches_exhaustive(monkeypatch, implied_credit, seed):
+    monkeypatch.setattr(app, "IMPLIED_CREDIT", implied_credit)
+    monkeypatch.setattr(topk, "IMPLIED_CREDIT", implied_credit)
+    rng = random.Random(seed)
+    index = TopKIndex([random_text(rng, rng.randint(0, 40)) for _ in range(150)])
+    for _ in range(5):
+        jd = random_text(rng, rng.randint(3, 15))
+        for k in (0, 1, 7, 50, 200):
+            results, _ = index.top_k(jd, k)
+            assert results == index.exhaustive_top_k(jd, k), (jd, k)
+            assert all(type(score) is float for _, score in results)
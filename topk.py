@@ -0,0 +1,212 @@
+# topk.py - TOP-K RANKING WITH MAXSCORE PRUNING
+"""
+"Top 50 candidates for this JD" without fully scoring every resume.
+
+The batch score (see batch.score_text) is a sum of per-term contributions:
+each JD skill token a resume is credited with adds its credit (1 for an
+exact or alias match, IMPLIED_CREDIT for an implied one, RELATED_CREDIT for
+a related one) times
+100 * KEYWORD_WEIGHT / |JD skills|, and each shared TF-IDF term adds
+100 * SEMANTIC_WEIGHT * q_t * d_t. A token's credit for a resume comes from
+postings over resume skill tokens and taxonomy skills built up front. That makes it
+a fit for MaxScore dynamic pruning over term posting lists: every list knows
+its largest possible contribution, lists whose combined upper bound cannot
+lift a resume past the current k-th best score become "non-essential", and a
+resume is only looked up in them while it can still make the top k.
+
+Results are identical to exhaustively scoring every resume with
+batch.score_text and sorting by (score desc, resume id asc).
+"""
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from heapq import heappush, heapreplace
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app import (
+    IMPLIED_CREDIT,
+    KEYWORD_WEIGHT,
+    RELATED_CREDIT,
+    SEMANTIC_WEIGHT,
+    SKILL_TAXONOMY,
+    SKILL_TOKENS,
+    SKILL_VOCABULARY,
+    extract_skill_ids,
+)
+from batch import _analyzer, fit_corpus, jd_skill_sets, jd_vector, score_text
+
+# Scores are compared after rounding so summation order can't flip ties
+SCORE_DECIMALS = 9
+# How a token was credited, in the order app.match_skill_tokens settles them
+DIRECT, IMPLIED, RELATED = 3, 2, 1
+
+
+class PostingList:
+    __slots__ = ("docs", "contribs", "upper_bound")
+
+    def __init__(self, docs: List[int], contribs: List[float]):
+        self.docs = docs
+        self.contribs = contribs
+        self.upper_bound = max(contribs) if contribs else 0.0
+
+
+class TopKIndex:
+    """Inverted index over a resume corpus for pruned top-k retrieval"""
+
+    def __init__(self, texts: Sequence[str]):
+        self.texts = list(texts)
+        self.n_docs = len(self.texts)
+        terms, self.idf = fit_corpus(self.texts) if self.texts else ([], np.zeros(0))
+        self.term_ids = {t: i for i, t in enumerate(terms)}
+
+        skill_docs = defaultdict(list)
+        taxonomy_docs = defaultdict(list)
+        term_docs = defaultdict(list)
+        term_weights = defaultdict(list)
+        for doc_id, text in enumerate(self.texts):
+            # Skill postings are keyed by ids in the shared SKILL_VOCABULARY
+            for skill_id in extract_skill_ids(text).tolist():
+                skill_docs[skill_id].append(doc_id)
+            for skill in SKILL_TAXONOMY.skills_in(text):
+                taxonomy_docs[skill].append(doc_id)
+            counts = Counter(_analyzer(text.lower()))
+            weights = {
+                self.term_ids[t]: c * self.idf[self.term_ids[t]]
+                for t, c in counts.items() if t in self.term_ids
+            }
+            norm = np.sqrt(sum(w * w for w in weights.values()))
+            for term_id, w in weights.items():
+                term_docs[term_id].append(doc_id)
+                term_weights[term_id].append(w / norm)
+
+        self.skill_postings = dict(skill_docs)
+        self.taxonomy_postings = dict(taxonomy_docs)
+        self.term_postings = {t: (term_docs[t], term_weights[t]) for t in term_docs}
+
+    def _skill_credits(self, jd_skills, jd_taxonomy_skills) -> Dict[str, Dict[int, float]]:
+        """JD skill token -> {resume id: credit}, as app.match_skill_tokens would give it"""
+        kinds = {
+            skill: dict.fromkeys(self.skill_postings.get(SKILL_VOCABULARY.ids.get(skill), ()), DIRECT)
+            for skill in jd_skills
+        }
+        for target in jd_taxonomy_skills:
+            tokens = SKILL_TOKENS[target] & jd_skills
+            if not tokens:
+                continue
+            bit = SKILL_TAXONOMY.bit[target]
+            # Resumes naming the target, a skill that implies it, or one related to it
+            for skill, docs in self.taxonomy_postings.items():
+                if skill == target:
+                    kind = DIRECT
+                elif SKILL_TAXONOMY.implies[SKILL_TAXONOMY.bit[skill]] >> bit & 1:
+                    kind = IMPLIED
+                elif SKILL_TAXONOMY.related[SKILL_TAXONOMY.bit[skill]] >> bit & 1:
+                    kind = RELATED
+                else:
+                    continue
+                for token in tokens:
+                    token_kinds = kinds[token]
+                    for doc in docs:
+                        if token_kinds.get(doc, 0) < kind:
+                            token_kinds[doc] = kind
+        credit = {DIRECT: 1.0, IMPLIED: IMPLIED_CREDIT, RELATED: RELATED_CREDIT}
+        return {
+            token: {doc: credit[kind] for doc, kind in token_kinds.items()}
+            for token, token_kinds in kinds.items()
+        }
+
+    def _query_lists(self, jd) -> List[PostingList]:
+        jd_text = jd if isinstance(jd, str) else jd.text
+        jd_skills, jd_taxonomy_skills = jd_skill_sets(jd)
+
+        lists = []
+        if jd_skills:
+            per_skill = 100 * KEYWORD_WEIGHT / len(jd_skills)
+            for token_credits in self._skill_credits(jd_skills, jd_taxonomy_skills).values():
+                if token_credits:
+                    docs = sorted(token_credits)
+                    lists.append(PostingList(docs, [per_skill * token_credits[d] for d in docs]))
+        for term_id, q in jd_vector(jd_text, self.term_ids, self.idf).items():
+            docs, weights = self.term_postings[term_id]
+            lists.append(PostingList(docs, [100 * SEMANTIC_WEIGHT * q * w for w in weights]))
+        return lists
+
+    def top_k(self, jd, k: int = 50) -> Tuple[List[Tuple[int, float]], Dict[str, Any]]:
+        """Best k (resume id, score) pairs and pruning statistics"""
+        if k <= 0:
+            return [], {"docs": self.n_docs, "evaluated": 0, "pruned": 0, "skipped": self.n_docs}
+        lists = sorted(self._query_lists(jd), key=lambda pl: pl.upper_bound)
+        # prefix_ub[i]: best total the lists[0..i] could add to any resume
+        prefix_ub = np.cumsum([pl.upper_bound for pl in lists]).tolist()
+        pos = [0] * len(lists)
+
+        heap: List[Tuple[float, int]] = []  # (score, -doc): heap[0] is the k-th best
+        threshold = float("-inf")
+        first_essential = 0
+        evaluated = pruned = 0
+
+        while True:
+            doc = min(
+                (lists[i].docs[pos[i]] for i in range(first_essential, len(lists)) if pos[i] < len(lists[i].docs)),
+                default=None,
+            )
+            if doc is None:
+                break
+
+            score = 0.0
+            for i in range(first_essential, len(lists)):
+                pl = lists[i]
+                if pos[i] < len(pl.docs) and pl.docs[pos[i]] == doc:
+                    score += pl.contribs[pos[i]]
+                    pos[i] += 1
+
+            # Non-essential lists, largest bounds first, while the doc can still qualify
+            complete = True
+            for i in range(first_essential - 1, -1, -1):
+                if round(score + prefix_ub[i], SCORE_DECIMALS) <= threshold:
+                    complete = False
+                    break
+                pl = lists[i]
+                pos[i] = bisect_left(pl.docs, doc, pos[i])
+                if pos[i] < len(pl.docs) and pl.docs[pos[i]] == doc:
+                    score += pl.contribs[pos[i]]
+            if not complete:
+                pruned += 1
+                continue
+
+            evaluated += 1
+            score = round(score, SCORE_DECIMALS)
+            if len(heap) < k:
+                heappush(heap, (score, -doc))
+            elif score > threshold:
+                heapreplace(heap, (score, -doc))
+            else:
+                continue
+            if len(heap) == k:
+                threshold = heap[0][0]
+                while first_essential < len(lists) and round(prefix_ub[first_essential], SCORE_DECIMALS) <= threshold:
+                    first_essential += 1
+
+        results = sorted(((-neg_doc, score) for score, neg_doc in heap), key=lambda r: (-r[1], r[0]))
+        stats = {
+            "docs": self.n_docs,
+            "evaluated": evaluated,
+            "pruned": pruned,
+            "skipped": self.n_docs - evaluated,
+        }
+        return [(doc, round(float(score), 2)) for doc, score in results], stats
+
+    def exhaustive_top_k(self, jd, k: int = 50) -> List[Tuple[int, float]]:
+        """Reference ranking: score every resume with batch.score_text"""
+        jd_text = jd if isinstance(jd, str) else jd.text
+        jd_skills, jd_taxonomy_skills = jd_skill_sets(jd)
+        jd_vec = jd_vector(jd_text, self.term_ids, self.idf)
+        scored = [
+            (doc, round(score_text(text, jd_skills, jd_taxonomy_skills, jd_vec, self.term_ids, self.idf)[0],
+                        SCORE_DECIMALS))
+            for doc, text in enumerate(self.texts)
+        ]
+        scored = [(doc, s) for doc, s in scored if s > 0]
+        scored.sort(key=lambda r: (-r[1], r[0]))
+        return [(doc, round(float(score), 2)) for doc, score in scored[:k]]